@@ -5,16 +5,24 @@ import threading
 import time
 import yaml
 from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Dict, List, Optional, Sequence, Tuple, Union, cast
 
 from naomi import NaomiSettingsPatcher
 from netdimm import NetDimmInfo, NetDimmException, NetDimmVersionEnum, NetDimmTargetEnum, CRCStatusEnum
+from netboot.fileutils import atomic_write
 from netboot.hostutils import Host, HostStatusEnum, SettingsEnum
 from netboot.log import log
 from smartoutlet import OutletInterface, ALL_OUTLET_CLASSES
 
 
+# Use libyaml's parser and emitter when PyYAML was built with them, they're a lot faster
+# than the pure python ones and behave the same for the plain types we read and write.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
 class CabinetException(Exception):
     pass
 
@@ -317,6 +325,10 @@ class Cabinet:
                         # Skip sending game, there's nothing to send
                         self.__print(f"Cabinet {self.ip} has no associated game, waiting for power off.")
                         self.__state = (CabinetStateEnum.STATE_WAIT_FOR_CABINET_POWER_OFF, 0)
+                    elif self.__host.cancelling:
+                        # The transfer we cancelled last time the cabinet went away is still
+                        # unwinding, so stay put and try again on the next tick.
+                        pass
                     else:
                         try:
                             info = self.__host.info()
@@ -487,6 +499,7 @@ class CabinetManager:
     def __init__(self, cabinets: Sequence[Cabinet]) -> None:
         self.__cabinets: Dict[str, Cabinet] = {cab.ip: cab for cab in cabinets}
         self.__lock: threading.Lock = threading.Lock()
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor()
         self.__thread: threading.Thread = threading.Thread(target=self.__poll_thread)
         self.__thread.setDaemon(True)
         self.__thread.start()
@@ -497,7 +510,7 @@ class CabinetManager:
     @staticmethod
     def from_yaml(yaml_file: str) -> "CabinetManager":
         with open(yaml_file, "r") as fp:
-            data = yaml.safe_load(fp)
+            data = yaml.load(fp, Loader=_YamlLoader)
 
         if data is None:
             # Assume this is an empty file
@@ -563,8 +576,10 @@ class CabinetManager:
 
         return CabinetManager(cabinets)
 
-    def to_yaml(self, yaml_file: str) -> None:
-        data: Dict[str, Dict[str, Optional[Union[bool, str, Optional[int], Dict[str, List[str]], Dict[str, List[int]], Dict[str, Optional[str]], Dict[str, object]]]]] = {}
+    def to_dict(self) -> Dict[str, Dict[str, object]]:
+        # Everything in here is a copy, so that the result can be written out while
+        # cabinets continue to be modified elsewhere.
+        data: Dict[str, Dict[str, object]] = {}
 
         with self.__lock:
             cabinets: List[Cabinet] = sorted([cab for _, cab in self.__cabinets.items()], key=lambda cab: cab.ip)
@@ -579,11 +594,11 @@ class CabinetManager:
                 'time_hack': cab.time_hack,
                 'skip_crc': cab.skip_crc,
                 'skip_now_load': cab.skip_now_load,
-                'roms': cab.patches,
+                'roms': {rom: list(patches) for (rom, patches) in cab.patches.items()},
                 # Bytes isn't a serializable type, so serialize it as a list of ints. If the settings is
                 # None for a ROM, serialize it as an empty list.
                 'settings': {rom: [x for x in (settings or [])] for (rom, settings) in cab.settings.items()},
-                'srams': cab.srams,
+                'srams': dict(cab.srams),
                 'controllable': cab.controllable,
                 'power_cycle': cab.power_cycle,
             }
@@ -594,16 +609,26 @@ class CabinetManager:
             if cab.outlet is not None:
                 data[cab.ip]['outlet'] = cab.outlet
 
-        with open(yaml_file, "w") as fp:
-            yaml.dump(data, fp)
+        return data
+
+    @staticmethod
+    def write_yaml(data: Dict[str, Dict[str, object]], yaml_file: str) -> None:
+        with atomic_write(yaml_file) as fp:
+            yaml.dump(data, fp, Dumper=_YamlDumper)
+
+    def to_yaml(self, yaml_file: str) -> None:
+        CabinetManager.write_yaml(self.to_dict(), yaml_file)
 
     def __poll_thread(self) -> None:
         while True:
             with self.__lock:
                 cabinets: List[Cabinet] = [cab for _, cab in self.__cabinets.items()]
 
-            for cabinet in cabinets:
-                cabinet.tick()
+            # Tick every cabinet at once. A tick can block on the network (asking a net dimm
+            # for its info, waiting for a transfer to start) or on disk (checking a game's CRC),
+            # so doing them one after another means one slow cabinet delays all of the others.
+            for _ in self.__executor.map(lambda cabinet: cabinet.tick(), cabinets):
+                pass
 
             time.sleep(1)
 
@@ -3,7 +3,7 @@ import os.path
 import threading
 import zlib
 
-from typing import Dict, List, Mapping, Sequence
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
 from netboot.cabinet import CabinetRegionEnum
 from naomi import NaomiRom, NaomiRomRegionEnum
 
@@ -16,7 +16,9 @@ class DirectoryManager:
     def __init__(self, directories: Sequence[str], checksums: Mapping[str, str]) -> None:
         self.__checksums: Dict[str, str] = dict(checksums)
         self.__directories = list(directories)
+        self.__directories_set: FrozenSet[str] = frozenset(self.__directories)
         self.__names: Dict[str, str] = {}
+        self.__version: int = 0
         self.__lock: threading.Lock = threading.Lock()
 
     @property
@@ -24,64 +26,97 @@ class DirectoryManager:
         with self.__lock:
             return [d for d in self.__directories]
 
+    @property
+    def directories_set(self) -> FrozenSet[str]:
+        # The managed directories never change, so this can be handed out as-is.
+        return self.__directories_set
+
+    @property
+    def version(self) -> int:
+        # Bumped every time a game name changes, so callers can tell whether
+        # anything they built out of game names is still current.
+        with self.__lock:
+            return self.__version
+
     @property
     def checksums(self) -> Dict[str, str]:
         with self.__lock:
-            return self.__checksums
+            return dict(self.__checksums)
 
     def games(self, directory: str) -> List[str]:
         with self.__lock:
             if directory not in self.__directories:
                 raise DirectoryException(f"Directory {directory} is not managed by us!")
-            return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
 
-    def game_name(self, filename: str, region: CabinetRegionEnum) -> str:
-        with self.__lock:
-            local_key = f"{region.value}-{filename}"
-            if local_key in self.__names:
-                return self.__names[local_key]
+        # Listing the directory doesn't touch any of our own state, so don't hold the
+        # lock while we wait on the filesystem.
+        return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
 
-            # Grab enough of the header for a match
-            with open(filename, "rb") as fp:
-                data = fp.read(0x1000)
-                length = os.fstat(fp.fileno()).st_size
+    def __read_header(self, filename: str) -> Tuple[bytes, int]:
+        # Grab enough of the header for a match
+        with open(filename, "rb") as fp:
+            data = fp.read(0x1000)
+            length = os.fstat(fp.fileno()).st_size
+        return data, length
 
-            # Now, check and see if we have a checksum match
-            crc = zlib.crc32(data, 0)
-            checksum = f"{region.value}-{crc}-{length}"
-            if checksum in self.__checksums:
-                self.__names[local_key] = self.__checksums[checksum]
-                return self.__names[local_key]
-
-            # Now, see if we can figure out from the header
-            rom = NaomiRom(data)
-            if rom.valid:
-                # Arbitrarily choose Japan as default region
-                naomi_region = {
-                    CabinetRegionEnum.REGION_JAPAN: NaomiRomRegionEnum.REGION_JAPAN,
-                    CabinetRegionEnum.REGION_USA: NaomiRomRegionEnum.REGION_USA,
-                    CabinetRegionEnum.REGION_EXPORT: NaomiRomRegionEnum.REGION_EXPORT,
-                    CabinetRegionEnum.REGION_KOREA: NaomiRomRegionEnum.REGION_KOREA,
-                    CabinetRegionEnum.REGION_AUSTRALIA: NaomiRomRegionEnum.REGION_AUSTRALIA,
-                }.get(region, NaomiRomRegionEnum.REGION_JAPAN)
-                self.__names[local_key] = rom.names[naomi_region]
-                self.__checksums[checksum] = self.__names[local_key]
-                return self.__names[local_key]
-
-            # Finally, fall back to filename, getting rid of extensions and underscores
-            self.__names[local_key] = os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')
+    def __game_name(self, filename: str, region: CabinetRegionEnum, header: Callable[[], Tuple[bytes, int]]) -> str:
+        local_key = f"{region.value}-{filename}"
+        if local_key in self.__names:
+            return self.__names[local_key]
+
+        data, length = header()
+
+        # Now, check and see if we have a checksum match
+        crc = zlib.crc32(data, 0)
+        checksum = f"{region.value}-{crc}-{length}"
+        if checksum in self.__checksums:
+            self.__names[local_key] = self.__checksums[checksum]
+            return self.__names[local_key]
+
+        # Now, see if we can figure out from the header
+        rom = NaomiRom(data)
+        if rom.valid:
+            # Arbitrarily choose Japan as default region
+            naomi_region = {
+                CabinetRegionEnum.REGION_JAPAN: NaomiRomRegionEnum.REGION_JAPAN,
+                CabinetRegionEnum.REGION_USA: NaomiRomRegionEnum.REGION_USA,
+                CabinetRegionEnum.REGION_EXPORT: NaomiRomRegionEnum.REGION_EXPORT,
+                CabinetRegionEnum.REGION_KOREA: NaomiRomRegionEnum.REGION_KOREA,
+                CabinetRegionEnum.REGION_AUSTRALIA: NaomiRomRegionEnum.REGION_AUSTRALIA,
+            }.get(region, NaomiRomRegionEnum.REGION_JAPAN)
+            self.__names[local_key] = rom.names[naomi_region]
             self.__checksums[checksum] = self.__names[local_key]
             return self.__names[local_key]
 
+        # Finally, fall back to filename, getting rid of extensions and underscores
+        self.__names[local_key] = os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')
+        self.__checksums[checksum] = self.__names[local_key]
+        return self.__names[local_key]
+
+    def game_name(self, filename: str, region: CabinetRegionEnum) -> str:
+        with self.__lock:
+            return self.__game_name(filename, region, lambda: self.__read_header(filename))
+
+    def game_names(self, filename: str, regions: Sequence[CabinetRegionEnum]) -> Dict[CabinetRegionEnum, str]:
+        with self.__lock:
+            # Look up several regions at once, reading the header off disk at most
+            # once no matter how many of them we haven't seen before.
+            header: Optional[Tuple[bytes, int]] = None
+
+            def get_header() -> Tuple[bytes, int]:
+                nonlocal header
+                if header is None:
+                    header = self.__read_header(filename)
+                return header
+
+            return {region: self.__game_name(filename, region, get_header) for region in regions}
+
     def rename_game(self, filename: str, region: CabinetRegionEnum, name: str) -> None:
         with self.__lock:
             # Make the local key
             local_key = f"{region.value}-{filename}"
 
-            # Grab enough of the header for a match
-            with open(filename, "rb") as fp:
-                data = fp.read(0x1000)
-                length = os.fstat(fp.fileno()).st_size
+            data, length = self.__read_header(filename)
 
             # Now, check and see if we have a checksum match
             crc = zlib.crc32(data, 0)
@@ -90,3 +125,4 @@ class DirectoryManager:
             # Update the value
             self.__names[local_key] = name
             self.__checksums[checksum] = self.__names[local_key]
+            self.__version += 1
@@ -0,0 +1,47 @@
+import os
+import stat
+import uuid
+from contextlib import contextmanager
+from typing import Generator, TextIO
+
+
+@contextmanager
+def atomic_write(filename: str) -> Generator[TextIO, None, None]:
+    # Write to a temporary file next to the real one and swap it into place once
+    # everything is on disk, so a crash mid-write never leaves a truncated config.
+    # Resolve symlinks so we replace the file they point at instead of the link.
+    filename = os.path.realpath(filename)
+    tmpname = os.path.join(os.path.dirname(filename), f".{os.path.basename(filename)}.{uuid.uuid4().hex}.tmp")
+
+    # Create it the same way a plain open() would, so a brand new file gets the
+    # permissions the umask says it should.
+    fd = os.open(tmpname, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", buffering=64 * 1024) as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        # Replacing an existing file shouldn't change who can read or edit it. We
+        # usually run as root, and people hand-edit these files as themselves.
+        try:
+            st = os.stat(filename)
+        except FileNotFoundError:
+            pass
+        else:
+            os.chmod(tmpname, stat.S_IMODE(st.st_mode))
+            if hasattr(os, "chown"):
+                tmpst = os.stat(tmpname)
+                if (tmpst.st_uid, tmpst.st_gid) != (st.st_uid, st.st_gid):
+                    try:
+                        os.chown(tmpname, st.st_uid, st.st_gid)
+                    except PermissionError:
+                        # Only root can give files away, so do the best we can.
+                        pass
+        os.replace(tmpname, filename)
+    except BaseException:
+        try:
+            os.unlink(tmpname)
+        except FileNotFoundError:
+            pass
+        raise
@@ -1,17 +1,21 @@
-import multiprocessing
-import multiprocessing.synchronize
+import mmap
 import os
 import platform
-import psutil  # type: ignore
 import queue
+import select
+import socket
+import struct
 import subprocess
-import sys
 import threading
 import time
+import weakref
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Dict, Optional, Sequence, Tuple, Union, overload
+from functools import lru_cache
+from typing import Any, Dict, Generator, List, Optional, Sequence, Set, Tuple, Union, overload
 
 from arcadeutils import FileBytes, BinaryDiff
+from cachetools import LRUCache
 from netboot.log import log
 from netdimm import NetDimm, NetDimmInfo, NetDimmException, NetDimmVersionEnum, NetDimmTargetEnum
 from naomi import NaomiSettingsPatcher, get_default_trojan as get_default_naomi_trojan
@@ -22,6 +26,20 @@ class SettingsEnum(Enum):
     SETTINGS_SRAM = "sram"
 
 
+@lru_cache(maxsize=64)
+def _load_patch(patch: str, mtime: float) -> Tuple[str, ...]:
+    # The modification time is only here so that editing a patch file on disk
+    # gets us a fresh copy instead of the cached one.
+    with open(patch, "r") as pp:
+        return tuple(d.strip() for d in pp.readlines() if d.strip())
+
+
+@lru_cache(maxsize=None)
+def _get_default_trojan() -> bytes:
+    # The trojan never changes while we're running, so only read it off disk once.
+    return get_default_naomi_trojan()
+
+
 @overload
 def _handle_patches(data: bytes, target: NetDimmTargetEnum, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> bytes:
     ...
@@ -35,28 +53,69 @@ def _handle_patches(data: FileBytes, target: NetDimmTargetEnum, patches: Sequenc
 def _handle_patches(data: Union[bytes, FileBytes], target: NetDimmTargetEnum, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> Union[bytes, FileBytes]:
     # Patch it
     for patch in patches:
-        with open(patch, "r") as pp:
-            differences = pp.readlines()
-        differences = [d.strip() for d in differences if d.strip()]
-        data = BinaryDiff.patch(data, differences)
-
-    for typ, setting in settings.items():
-        if typ == SettingsEnum.SETTINGS_EEPROM:
-            # Attach any settings file requested.
-            if target == NetDimmTargetEnum.TARGET_NAOMI:
-                patcher = NaomiSettingsPatcher(data, get_default_naomi_trojan())
-                patcher.put_eeprom(setting)
-                data = patcher.data
-        elif typ == SettingsEnum.SETTINGS_SRAM:
-            # Attach any settings file requested.
-            if target == NetDimmTargetEnum.TARGET_NAOMI:
-                patcher = NaomiSettingsPatcher(data, get_default_naomi_trojan())
-                patcher.put_sram(setting)
-                data = patcher.data
+        differences = _load_patch(patch, os.path.getmtime(patch))
+        data = BinaryDiff.patch(data, list(differences))
+
+    if target == NetDimmTargetEnum.TARGET_NAOMI:
+        eeprom = settings.get(SettingsEnum.SETTINGS_EEPROM)
+        sram = settings.get(SettingsEnum.SETTINGS_SRAM)
+        if eeprom is not None or sram is not None:
+            # Attach any settings files requested. A single patcher can handle both,
+            # so we only need to parse the ROM header once.
+            patcher = NaomiSettingsPatcher(data, _get_default_trojan())
+            if eeprom is not None:
+                patcher.put_eeprom(eeprom)
+            if sram is not None:
+                patcher.put_sram(sram)
+            data = patcher.data
 
     return data
 
 
+@contextmanager
+def _open_image(filename: str, target: NetDimmTargetEnum, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> Generator[Union[FileBytes, mmap.mmap], None, None]:
+    # Grab the image itself
+    with open(filename, "rb") as fp:
+        if not patches and not settings and os.fstat(fp.fileno()).st_size > 0:
+            # Nothing to patch, so map the file directly and let the kernel page it in
+            # as we walk it instead of copying every chunk through read() calls.
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield mm
+            finally:
+                mm.close()
+        else:
+            if hasattr(os, "posix_fadvise"):
+                # We walk the whole image front to back, so let the kernel read
+                # ahead aggressively while we're busy patching or sending.
+                os.posix_fadvise(fp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            # Get a memory-based file representation so we don't load
+            # too much data into RAM at once, and then patch it.
+            yield _handle_patches(FileBytes(fp), target, patches, settings)
+
+
+_crc_cache: "LRUCache[Tuple[object, ...], int]" = LRUCache(maxsize=64)
+_crc_lock: threading.Lock = threading.Lock()
+
+
+def _crc_key(filename: str, target: NetDimmTargetEnum, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> Tuple[object, ...]:
+    # Key on file modification times and sizes as well as names, so that replacing
+    # a ROM or editing a patch invalidates any previously calculated CRC.
+    def stat(filename: str) -> Tuple[str, int, int]:
+        st = os.stat(filename)
+        return (filename, st.st_mtime_ns, st.st_size)
+
+    return (
+        stat(filename),
+        target,
+        tuple(stat(patch) for patch in patches),
+        tuple(sorted((typ.value, setting) for typ, setting in settings.items())),
+    )
+
+
 def _send_file_to_host(
     host: str,
     filename: str,
@@ -65,29 +124,32 @@ def _send_file_to_host(
     target: NetDimmTargetEnum,
     version: NetDimmVersionEnum,
     timeout: Optional[int],
-    parent_pid: int,
-    progress_queue: "multiprocessing.Queue[Tuple[str, Any]]",
+    cancelled: threading.Event,
+    progress_queue: "queue.Queue[Tuple[str, Any]]",
     skip_crc: Optional[bool] = False,
     skip_now_load: Optional[bool] = False,
 ) -> None:
+    last_percent: int = -1
+
     def capture_progress(sent: int, total: int) -> None:
-        # See if we need to bail out since our parent disappeared
-        if not psutil.pid_exists(parent_pid):
-            sys.exit(1)
-        progress_queue.put(("progress", (sent, total)))
+        nonlocal last_percent
 
-    try:
-        netdimm = NetDimm(host, version=version, timeout=timeout)
+        # See if we need to bail out since the host went away mid-transfer
+        if cancelled.is_set():
+            raise HostException("Transfer was cancelled")
 
-        # Grab the image itself
-        with open(filename, "rb") as fp:
-            # Get a memory-based file representation so we don't load
-            # too much data into RAM at once.
-            data = FileBytes(fp)
+        # Only report whole percentage changes, so that a fast transfer doesn't
+        # flood the queue with updates nobody will ever look at.
+        percent = int(float(sent * 100) / float(total)) if total else 100
+        if percent != last_percent:
+            last_percent = percent
+            progress_queue.put(("progress", (sent, total)))
 
-            # Patch it
-            data = _handle_patches(data, target, patches, settings)
+    try:
+        netdimm = NetDimm(host, version=version, timeout=timeout)
 
+        # Grab the image itself, patched and ready to go
+        with _open_image(filename, target, patches, settings) as data:
             # Send it
             netdimm.send(data, progress_callback=capture_progress, disable_crc_check=skip_crc, disable_now_loading=skip_now_load)
 
@@ -107,8 +169,141 @@ class HostStatusEnum(Enum):
     STATUS_FAILED = "failed"
 
 
+class _PingPoller:
+    """
+    A single background thread that pings every registered host once a round,
+    instead of every host forking its own ping process every second.
+    """
+
+    ROUND_SECONDS = 1.0
+
+    def __init__(self) -> None:
+        self.__hosts: "weakref.WeakSet[Host]" = weakref.WeakSet()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+        self.__sequence: int = 0
+
+    def register(self, host: "Host") -> None:
+        with self.__lock:
+            self.__hosts.add(host)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__poll_thread)
+                self.__thread.setDaemon(True)
+                self.__thread.start()
+
+    @staticmethod
+    def __icmp_socket() -> Optional[socket.socket]:
+        # Unprivileged ICMP sockets are available on Linux (subject to net.ipv4.ping_group_range)
+        # and macOS. Anywhere else, or if we aren't allowed, we fall back to the ping binary.
+        try:
+            return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def __checksum(packet: bytes) -> int:
+        if len(packet) & 1:
+            packet += b"\0"
+        total: int = sum(struct.unpack(f"!{len(packet) // 2}H", packet))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return (~total) & 0xFFFF
+
+    def __ping_icmp(self, sock: socket.socket, ips: Set[str]) -> Set[str]:
+        self.__sequence = (self.__sequence + 1) & 0xFFFF
+        header = struct.pack("!BBHHH", 8, 0, 0, 0, self.__sequence)
+        packet = struct.pack("!BBHHH", 8, 0, self.__checksum(header), 0, self.__sequence)
+
+        # Hosts can be configured by name, but replies come back from an address. So
+        # look up where each one lives and map replies back to what we were given.
+        addresses: Dict[str, Set[str]] = {}
+        for ip in ips:
+            try:
+                address = socket.gethostbyname(ip)
+            except OSError:
+                continue
+            addresses.setdefault(address, set()).add(ip)
+
+        for address in addresses:
+            try:
+                sock.sendto(packet, (address, 0))
+            except OSError:
+                pass
+
+        responded: Set[str] = set()
+        replied: Set[str] = set()
+        deadline = time.time() + self.ROUND_SECONDS
+        while len(replied) < len(addresses):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            try:
+                reply, (address, _) = sock.recvfrom(1024)
+            except OSError:
+                continue
+
+            # Some platforms hand us the IP header as well, skip past it.
+            if len(reply) >= 20 and (reply[0] >> 4) == 4:
+                reply = reply[((reply[0] & 0xF) * 4):]
+            if len(reply) < 8:
+                continue
+            typ, _, _, _, sequence = struct.unpack("!BBHHH", reply[:8])
+            if typ == 0 and sequence == self.__sequence and address in addresses:
+                replied.add(address)
+                responded.update(addresses[address])
+        return responded
+
+    def __ping_subprocess(self, ips: Set[str]) -> Set[str]:
+        # Start every ping at once and then wait on all of them, so that a round takes
+        # as long as the slowest host instead of the sum of all of them.
+        on_windows: bool = platform.system() == "Windows"
+        procs: Dict[str, "subprocess.Popen[bytes]"] = {}
+        for ip in ips:
+            if on_windows:
+                call = ["ping", "-n", "1", "-w", "1", ip]
+            else:
+                call = ["ping", "-c1", "-W1", ip]
+            try:
+                procs[ip] = subprocess.Popen(call, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError:
+                pass
+
+        return {ip for ip, proc in procs.items() if proc.wait() == 0}
+
+    def __poll_thread(self) -> None:
+        sock = self.__icmp_socket()
+
+        while True:
+            start = time.time()
+            with self.__lock:
+                hosts: List[Host] = list(self.__hosts)
+            hosts = [host for host in hosts if host._ping_due(start)]
+
+            if hosts:
+                ips = {host.ip for host in hosts}
+                if sock is not None:
+                    responded = self.__ping_icmp(sock, ips)
+                else:
+                    responded = self.__ping_subprocess(ips)
+
+                now = time.time()
+                for host in hosts:
+                    host._ping_result(host.ip in responded, now)
+
+            elapsed = time.time() - start
+            if elapsed < self.ROUND_SECONDS:
+                time.sleep(self.ROUND_SECONDS - elapsed)
+
+
+_poller = _PingPoller()
+
+
 class Host:
     DEBOUNCE_SECONDS = 3
+    MAX_UPDATES_PER_TICK = 64
 
     def __init__(
         self,
@@ -131,14 +326,19 @@ class Host:
         self.skip_crc: bool = skip_crc
         self.skip_now_load: bool = skip_now_load
         self.send_timeout: Optional[int] = send_timeout
-        self.__queue: "multiprocessing.Queue[Tuple[str, Any]]" = multiprocessing.Queue()
-        self.__lock: multiprocessing.synchronize.Lock = multiprocessing.Lock()
-        self.__proc: Optional[multiprocessing.Process] = None
+        self.__queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__transfer: Optional[threading.Thread] = None
+        self.__cancelled_transfer: Optional[threading.Thread] = None
+        self.__cancelled: threading.Event = threading.Event()
         self.__lastprogress: Tuple[int, int] = (-1, -1)
         self.__laststatus: Optional[HostStatusEnum] = None
-        self.__thread: threading.Thread = threading.Thread(target=self.__poll_thread)
-        self.__thread.setDaemon(True)
-        self.__thread.start()
+        self.__success_count: int = 0
+        self.__failure_count: int = 0
+        self.__next_ping: float = time.time()
+        self.__last_timehack: float = time.time()
+        self.__timehack_thread: Optional[threading.Thread] = None
+        _poller.register(self)
 
     def __repr__(self) -> str:
         return f"Host(ip={repr(self.ip)}, target={repr(self.target)}, version={repr(self.version)}, send_timeout={repr(self.send_timeout)}, time_hack={repr(self.time_hack)}, skip_crc={repr(self.skip_crc)}, skip_now_load={repr(self.skip_now_load)})"
@@ -147,64 +347,67 @@ class Host:
         if not self.quiet:
             log(string, newline=newline)
 
-    def __poll_thread(self) -> None:
-        success_count: int = 0
-        failure_count: int = 0
-        on_windows: bool = platform.system() == "Windows"
-        last_timehack: float = time.time()
-
-        while True:
-            # Dont bother if we're actively sending
-            if self.status != HostStatusEnum.STATUS_TRANSFERRING:
-                # Reset polling counts after explicit power down.
-                if self.__poll_reset:
-                    self.__poll_reset = False
-                    success_count = 0
-                    failure_count = 0
-
-                with open(os.devnull, 'w') as DEVNULL:
-                    try:
-                        if on_windows:
-                            call = ["ping", "-n", "1", "-w", "1", self.ip]
-                        else:
-                            call = ["ping", "-c1", "-W1", self.ip]
-                        subprocess.check_call(call, stdout=DEVNULL, stderr=DEVNULL)
-                        alive = True
-                    except subprocess.CalledProcessError:
-                        alive = False
-
-                # Only claim up if it response to a number of pings.
-                if alive:
-                    success_count += 1
-                    failure_count = 0
-                    if success_count >= self.DEBOUNCE_SECONDS:
-                        with self.__lock:
-                            if self.__alive != alive:
-                                self.__print(f"Host {self.ip} started responding to ping, marking up.")
-                            self.__alive = True
-
-                    # Perform the time hack if so requested.
-                    current = time.time()
-                    if (current - last_timehack) >= 5.0:
-                        last_timehack = current
-                        with self.__lock:
-                            if self.time_hack:
-                                netdimm = NetDimm(self.ip, version=self.version, timeout=5)
-                                try:
-                                    netdimm.set_time_limit(10)
-                                    self.__print(f"Host {self.ip} reset time limit with time hack.")
-                                except NetDimmException:
-                                    pass
-                else:
-                    success_count = 0
-                    failure_count += 1
-                    if failure_count >= self.DEBOUNCE_SECONDS:
-                        with self.__lock:
-                            if self.__alive != alive:
-                                self.__print(f"Host {self.ip} stopped responding to ping, marking down.")
-                            self.__alive = False
-
-            time.sleep(2 if success_count >= self.DEBOUNCE_SECONDS else 1)
+    def _ping_due(self, now: float) -> bool:
+        """
+        Called by the shared ping poller to ask whether this host should be pinged
+        this round.
+        """
+        # Dont bother if we're actively sending. This deliberately doesn't go through
+        # status, since that waits on our lock which is held across net dimm requests,
+        # and a slow or unreachable net dimm would then stall pings for every host.
+        if self.__transfer is not None:
+            return False
+
+        # Reset polling counts after explicit power down.
+        if self.__poll_reset:
+            self.__poll_reset = False
+            self.__success_count = 0
+            self.__failure_count = 0
+            self.__next_ping = now
+
+        return now >= self.__next_ping
+
+    def _ping_result(self, alive: bool, now: float) -> None:
+        """
+        Called by the shared ping poller with the result of pinging this host.
+        """
+        # Only claim up if it response to a number of pings.
+        if alive:
+            self.__success_count += 1
+            self.__failure_count = 0
+            if self.__success_count >= self.DEBOUNCE_SECONDS:
+                # Same as above, don't take our lock on the shared poller thread.
+                if self.__alive != alive:
+                    self.__print(f"Host {self.ip} started responding to ping, marking up.")
+                self.__alive = True
+
+            # Perform the time hack if so requested. This talks to the net dimm, so do it
+            # off of the shared poller thread so a slow host can't hold up everyone else.
+            if (now - self.__last_timehack) >= 5.0:
+                self.__last_timehack = now
+                if self.time_hack and (self.__timehack_thread is None or not self.__timehack_thread.is_alive()):
+                    self.__timehack_thread = threading.Thread(target=self.__perform_time_hack)
+                    self.__timehack_thread.setDaemon(True)
+                    self.__timehack_thread.start()
+        else:
+            self.__success_count = 0
+            self.__failure_count += 1
+            if self.__failure_count >= self.DEBOUNCE_SECONDS:
+                if self.__alive != alive:
+                    self.__print(f"Host {self.ip} stopped responding to ping, marking down.")
+                self.__alive = False
+
+        self.__next_ping = now + (2 if self.__success_count >= self.DEBOUNCE_SECONDS else 1)
+
+    def __perform_time_hack(self) -> None:
+        with self.__lock:
+            if self.time_hack:
+                netdimm = NetDimm(self.ip, version=self.version, timeout=5)
+                try:
+                    netdimm.set_time_limit(10)
+                    self.__print(f"Host {self.ip} reset time limit with time hack.")
+                except NetDimmException:
+                    pass
 
     def reboot(self) -> bool:
         """
@@ -212,7 +415,7 @@ class Host:
         False if failed.
         """
         with self.__lock:
-            if self.__proc is not None:
+            if self.__transfer is not None:
                 raise HostException("Cannot reboot host mid-transfer.")
 
             netdimm = NetDimm(self.ip, version=self.version, timeout=5)
@@ -240,10 +443,23 @@ class Host:
             # Kill any active transfers, ensure that poll thread is reset.
             self.__poll_reset = True
             self.__alive = False
-            if self.__proc is not None:
-                self.__proc.terminate()
-                self.__proc.join()
-                self.__proc = None
+            if self.__transfer is not None:
+                # The transfer thread notices this on its next chunk and bails out. It
+                # has its own queue, so anything it still reports is simply dropped. It
+                # can be stuck in socket I/O for a while before it gets there though, so
+                # hang on to it so that send() knows not to start another one yet.
+                self.__cancelled.set()
+                self.__cancelled_transfer = self.__transfer
+                self.__transfer = None
+
+    @property
+    def cancelling(self) -> bool:
+        """
+        Whether a transfer we cancelled is still winding down. Nothing new can be
+        sent to the host until it has, so check this before calling send.
+        """
+        cancelled_transfer = self.__cancelled_transfer
+        return cancelled_transfer is not None and cancelled_transfer.is_alive()
 
     @property
     def status(self) -> HostStatusEnum:
@@ -254,10 +470,10 @@ class Host:
             if self.__laststatus is not None:
                 # If we have a status, that's the current deal
                 return self.__laststatus
-            if self.__proc is None:
-                # No proc means no current transfer
+            if self.__transfer is None:
+                # No thread means no current transfer
                 return HostStatusEnum.STATUS_INACTIVE
-            # If we got here, we have a proc and no status, so we're transferring
+            # If we got here, we have a thread and no status, so we're transferring
             return HostStatusEnum.STATUS_TRANSFERRING
 
     @property
@@ -276,15 +492,18 @@ class Host:
 
     def __update_progress(self) -> None:
         """
-        Update progress if needed, with respect to a separate send process. Note
+        Update progress if needed, with respect to a separate send thread. Note
         that this should only be called by something that has a lock.
         """
 
-        if self.__proc is None:
+        if self.__transfer is None:
             # Nothing to update here
             return
 
-        while True:
+        # Bound how long we can hold the lock for. Progress updates overwrite each
+        # other so we only ever care about the latest, and anything left over will
+        # be picked up on the next tick.
+        for _ in range(self.MAX_UPDATES_PER_TICK):
             try:
                 update = self.__queue.get_nowait()
             except queue.Empty:
@@ -296,7 +515,7 @@ class Host:
                 self.__lastprogress = (update[1][0], update[1][1])
                 continue
 
-            # Transfer finished, so we should update our final status and wait on the process
+            # Transfer finished, so we should update our final status and wait on the thread
             if update[0] == "success":
                 self.__print(f"Host {self.ip} succeeded in sending image.")
                 self.__laststatus = HostStatusEnum.STATUS_COMPLETED
@@ -305,43 +524,60 @@ class Host:
                 self.__laststatus = HostStatusEnum.STATUS_FAILED
             self.__lastprogress = (-1, -1)
 
-            self.__proc.join()
-            self.__proc = None
+            self.__transfer.join()
+            self.__transfer = None
             return
 
     def send(self, filename: str, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> None:
         with self.__lock:
-            if self.__proc is not None:
+            if self.__transfer is not None:
                 raise HostException("Host has active transfer already")
+            # Never talk to the net dimm from two transfers at once. Waiting here for a
+            # cancelled one to unwind would hold up everybody else, so callers should
+            # check cancelling first and come back later.
+            if self.__cancelled_transfer is not None:
+                if self.__cancelled_transfer.is_alive():
+                    raise HostException("Host is still finishing a cancelled transfer")
+                self.__cancelled_transfer = None
             self.__lastprogress = (-1, -1)
             self.__laststatus = None
             self.__print(f"Host {self.ip} started sending image. CRC verification disabled = {self.skip_crc}")
 
-            # Start the send
-            self.__proc = multiprocessing.Process(
+            # Start the send. Each transfer gets its own queue and cancellation flag so
+            # a cancelled transfer that is still winding down can't confuse the next one.
+            self.__queue = queue.Queue()
+            self.__cancelled = threading.Event()
+            self.__transfer = threading.Thread(
                 target=_send_file_to_host,
-                args=(self.ip, filename, patches, settings, self.target, self.version, self.send_timeout, os.getpid(), self.__queue, self.skip_crc, self.skip_now_load),
+                args=(self.ip, filename, patches, settings, self.target, self.version, self.send_timeout, self.__cancelled, self.__queue, self.skip_crc, self.skip_now_load),
             )
-            self.__proc.start()
+            self.__transfer.setDaemon(True)
+            self.__transfer.start()
 
-            # Don't yield control back until we have got the first response from the process
-            while self.__lastprogress == (-1, -1) and self.__proc is not None:
+            # Don't yield control back until we have got the first response from the thread
+            while self.__lastprogress == (-1, -1) and self.__transfer is not None:
                 self.__update_progress()
 
     def crc(self, filename: str, patches: Sequence[str], settings: Dict[SettingsEnum, bytes]) -> int:
-        # Grab the image itself
-        with open(filename, "rb") as fp:
-            data = FileBytes(fp)
-
-            # Patch it
-            data = _handle_patches(data, self.target, patches, settings)
-
+        # The CRC only depends on the contents of the image and patches, so if none of
+        # them changed since last time we don't need to walk the whole image again.
+        key = _crc_key(filename, self.target, patches, settings)
+        with _crc_lock:
+            if key in _crc_cache:
+                return _crc_cache[key]
+
+        # Grab the image itself, patched and ready to go
+        with _open_image(filename, self.target, patches, settings) as data:
             # Now, apply the CRC algorithm over it.
-            return NetDimm.crc(data)
+            crc = NetDimm.crc(data)
+
+        with _crc_lock:
+            _crc_cache[key] = crc
+        return crc
 
     def wipe(self) -> None:
         with self.__lock:
-            if self.__proc is not None:
+            if self.__transfer is not None:
                 # Host is actively transferring, can't do anything.
                 return
 
@@ -353,7 +589,7 @@ class Host:
 
     def info(self) -> Optional[NetDimmInfo]:
         with self.__lock:
-            if self.__proc is not None:
+            if self.__transfer is not None:
                 # Host is actively transferring, don't bother requesting info.
                 return None
 
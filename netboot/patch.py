@@ -2,7 +2,7 @@ import os
 import os.path
 import threading
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 from arcadeutils import FileBytes, BinaryDiff
 
 
@@ -13,19 +13,27 @@ class PatchException(Exception):
 class PatchManager:
     def __init__(self, directories: Sequence[str]) -> None:
         self.__directories = list(directories)
+        self.__directories_set: FrozenSet[str] = frozenset(self.__directories)
         self.__lock: threading.Lock = threading.Lock()
         self.__cache: Dict[str, List[str]] = {}
+        self.__names: Dict[str, Tuple[int, str]] = {}
 
     @property
     def directories(self) -> List[str]:
         with self.__lock:
             return [d for d in self.__directories]
 
+    @property
+    def directories_set(self) -> FrozenSet[str]:
+        return self.__directories_set
+
     def patches(self, directory: str) -> List[str]:
         with self.__lock:
             if directory not in self.__directories:
                 raise PatchException(f"Directory {directory} is not managed by us!")
-            return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
+
+        # No need to hold the lock while we wait on the filesystem.
+        return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
 
     def recalculate(self, filename: Optional[str] = None) -> None:
         with self.__lock:
@@ -37,10 +45,46 @@ class PatchManager:
 
     def patch_name(self, filename: str) -> str:
         with self.__lock:
+            # We get asked for the same names over and over when listing games, so only
+            # read and parse the patch again if it changed since last time.
+            mtime = os.stat(filename).st_mtime_ns
+            if filename in self.__names and self.__names[filename][0] == mtime:
+                return self.__names[filename][1]
+
             with open(filename, "r") as pp:
                 patchlines = pp.readlines()
 
-            return BinaryDiff.description(patchlines) or os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')
+            name = BinaryDiff.description(patchlines) or os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')
+            self.__names[filename] = (mtime, name)
+            return name
+
+    def __known_patches(self) -> List[Tuple[str, List[str]]]:
+        # Grab currently known patches, skipping any we can't read.
+        patches: List[Tuple[str, List[str]]] = []
+        for directory in self.__directories:
+            for f in os.listdir(directory):
+                patch = os.path.join(directory, f)
+                try:
+                    with open(patch, "r") as pp:
+                        patches.append((patch, pp.readlines()))
+                except Exception:
+                    continue
+        return patches
+
+    def __valid_patches(self, filename: str, patches: List[Tuple[str, List[str]]]) -> List[str]:
+        with open(filename, "rb") as fp:
+            # First, grab the file size, see if there are any patches at all for this file.
+            data = FileBytes(fp)
+
+            # Figure out which of these is valid for this filename
+            valid_patches: List[str] = []
+            for patch, patchlines in patches:
+                size = BinaryDiff.size(patchlines)
+                if size is None or size == len(data):
+                    if BinaryDiff.can_patch(data, patchlines, ignore_size_differences=True)[0]:
+                        valid_patches.append(patch)
+
+        return valid_patches
 
     def patches_for_game(self, filename: str) -> List[str]:
         with self.__lock:
@@ -48,27 +92,20 @@ class PatchManager:
             if filename in self.__cache:
                 return self.__cache[filename]
 
-            with open(filename, "rb") as fp:
-                # First, grab the file size, see if there are any patches at all for this file.
-                data = FileBytes(fp)
-
-                # Grab currently known patches
-                patches: List[str] = []
-                for directory in self.__directories:
-                    patches.extend(os.path.join(directory, f) for f in os.listdir(directory))
-
-                # Figure out which of these is valid for this filename
-                valid_patches: List[str] = []
-                for patch in patches:
-                    try:
-                        with open(patch, "r") as pp:
-                            patchlines = pp.readlines()
-                    except Exception:
-                        continue
-                    size = BinaryDiff.size(patchlines)
-                    if size is None or size == len(data):
-                        if BinaryDiff.can_patch(data, patchlines, ignore_size_differences=True)[0]:
-                            valid_patches.append(patch)
-
+            valid_patches = self.__valid_patches(filename, self.__known_patches())
             self.__cache[filename] = valid_patches
             return valid_patches
+
+    def patches_for_games(self, filenames: Sequence[str]) -> Dict[str, List[str]]:
+        with self.__lock:
+            # Same as patches_for_game, but only lists and reads the patch directories
+            # once no matter how many games we need to look at.
+            known: Optional[List[Tuple[str, List[str]]]] = None
+            retval: Dict[str, List[str]] = {}
+            for filename in filenames:
+                if filename not in self.__cache:
+                    if known is None:
+                        known = self.__known_patches()
+                    self.__cache[filename] = self.__valid_patches(filename, known)
+                retval[filename] = self.__cache[filename]
+            return retval
@@ -2,7 +2,7 @@ import os
 import os.path
 import threading
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 from arcadeutils import FileBytes, BinaryDiff, BinaryDiffException
 from naomi import NaomiRom, NaomiRomRegionEnum, NaomiSettingsPatcher, get_default_trojan
 from naomi.settings import NaomiSettingsWrapper, NaomiSettingsManager
@@ -15,6 +15,7 @@ class SettingsException(Exception):
 class SettingsManager:
     def __init__(self, naomi_directory: str) -> None:
         self.__naomi_directory = naomi_directory
+        self.__directories_set: FrozenSet[str] = frozenset([naomi_directory])
         self.__naomi_manager = NaomiSettingsManager(naomi_directory)
         self.__lock: threading.Lock = threading.Lock()
         self.__cache: Dict[str, List[str]] = {}
@@ -85,11 +86,16 @@ class SettingsManager:
         with self.__lock:
             return self.__directories()
 
+    @property
+    def directories_set(self) -> FrozenSet[str]:
+        return self.__directories_set
+
     def settings(self, directory: str) -> List[str]:
         with self.__lock:
             if directory not in self.__directories():
                 raise SettingsException(f"Directory {directory} is not managed by us!")
-            return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
+
+        return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
 
     def recalculate(self, filename: Optional[str] = None) -> None:
         with self.__lock:
@@ -2,7 +2,7 @@ import os
 import os.path
 import threading
 
-from typing import Dict, List, Optional, Sequence
+from typing import Dict, FrozenSet, List, Optional, Sequence
 from arcadeutils import FileBytes
 from naomi import NaomiRom, NaomiSettingsPatcher
 
@@ -14,6 +14,7 @@ class SRAMException(Exception):
 class SRAMManager:
     def __init__(self, directories: Sequence[str]) -> None:
         self.__directories = list(directories)
+        self.__directories_set: FrozenSet[str] = frozenset(self.__directories)
         self.__lock: threading.Lock = threading.Lock()
         self.__cache: Dict[str, List[str]] = {}
 
@@ -22,11 +23,16 @@ class SRAMManager:
         with self.__lock:
             return [d for d in self.__directories]
 
+    @property
+    def directories_set(self) -> FrozenSet[str]:
+        return self.__directories_set
+
     def srams(self, directory: str) -> List[str]:
         with self.__lock:
             if directory not in self.__directories:
                 raise SRAMException(f"Directory {directory} is not managed by us!")
-            return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
+
+        return sorted([f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))])
 
     def recalculate(self, filename: Optional[str] = None) -> None:
         with self.__lock:
@@ -40,34 +46,54 @@ class SRAMManager:
         with self.__lock:
             return os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')
 
+    def __known_srams(self) -> List[str]:
+        # Grab currently known SRAMs, keeping only the ones that are the right size.
+        srams: List[str] = []
+        for directory in self.__directories:
+            for f in os.listdir(directory):
+                sram = os.path.join(directory, f)
+                try:
+                    size = os.path.getsize(sram)
+                except Exception:
+                    size = 0
+
+                if size == NaomiSettingsPatcher.SRAM_SIZE:
+                    srams.append(sram)
+        return srams
+
+    def __supports_srams(self, filename: str) -> bool:
+        with open(filename, "rb") as fp:
+            # First, grab the file size, see if there are any srams at all for this file.
+            data = FileBytes(fp)
+
+            # If it's a Naomi ROM, so SRAMs must be 32kb in size.
+            rom = NaomiRom(data)
+            return rom.valid
+
     def srams_for_game(self, filename: str) -> List[str]:
         with self.__lock:
             # First, see if we already cached this file.
             if filename in self.__cache:
                 return self.__cache[filename]
 
-            valid_srams: List[str] = []
-            with open(filename, "rb") as fp:
-                # First, grab the file size, see if there are any srams at all for this file.
-                data = FileBytes(fp)
-
-                # If it's a Naomi ROM, so SRAMs must be 32kb in size.
-                rom = NaomiRom(data)
-                if rom.valid:
-                    # Grab currently known SRAMs
-                    srams: List[str] = []
-                    for directory in self.__directories:
-                        srams.extend(os.path.join(directory, f) for f in os.listdir(directory))
-
-                    # Figure out which of these is valid for this ROM type.
-                    for sram in srams:
-                        try:
-                            size = os.path.getsize(sram)
-                        except Exception:
-                            size = 0
-
-                        if size == NaomiSettingsPatcher.SRAM_SIZE:
-                            valid_srams.append(sram)
-
+            # Only bother scanning the SRAM directories for games that can use one.
+            valid_srams = self.__known_srams() if self.__supports_srams(filename) else []
             self.__cache[filename] = valid_srams
             return valid_srams
+
+    def srams_for_games(self, filenames: Sequence[str]) -> Dict[str, List[str]]:
+        with self.__lock:
+            # Same as srams_for_game, but only scans the SRAM directories once no
+            # matter how many games we need to look at.
+            known: Optional[List[str]] = None
+            retval: Dict[str, List[str]] = {}
+            for filename in filenames:
+                if filename not in self.__cache:
+                    if self.__supports_srams(filename):
+                        if known is None:
+                            known = self.__known_srams()
+                        self.__cache[filename] = list(known)
+                    else:
+                        self.__cache[filename] = []
+                retval[filename] = self.__cache[filename]
+            return retval
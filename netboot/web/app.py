@@ -1,18 +1,35 @@
+import atexit
+import hashlib
+import orjson
 import os
 import os.path
+import threading
+import time
 import yaml
 import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from functools import wraps
-from typing import Callable, Dict, List, Any, Optional, cast
+from operator import itemgetter
+from stat import S_ISDIR
+from typing import Callable, DefaultDict, Dict, List, Any, Optional, Sequence, Tuple, Union
 
-from flask import Flask, Response, request, render_template, make_response, jsonify as flask_jsonify
+from flask import Flask, Response, request, render_template, make_response
+from flask.json.provider import JSONProvider
 from werkzeug.routing import PathConverter
 from netdimm import NetDimm, NetDimmVersionEnum, NetDimmTargetEnum
 from naomi import NaomiRomRegionEnum
 from netboot import Cabinet, CabinetRegionEnum, CabinetPowerStateEnum, CabinetManager, DirectoryManager, PatchManager, SRAMManager, SettingsManager
+from netboot.fileutils import atomic_write
 from smartoutlet import ALL_OUTLET_CLASSES
 
 
+# Use libyaml's parser and emitter when PyYAML was built with them, they're a lot faster
+# than the pure python ones and behave the same for the plain types we read and write.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 current_directory: str = os.path.abspath(os.path.dirname(__file__))
 
 app = Flask(
@@ -20,6 +37,69 @@ app = Flask(
     static_folder=os.path.join(current_directory, 'staticfile'),
     template_folder=os.path.join(current_directory, 'templates'),
 )
+# Our largest legitimate request is the game list for a cabinet with all of its settings,
+# so anything past this is junk that isn't worth reading, let alone parsing.
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024 * 1024
+
+# None of these can change while we're running, so build them once up front.
+_NAMED_REGIONS: List[CabinetRegionEnum] = [cr for cr in CabinetRegionEnum if cr != CabinetRegionEnum.REGION_UNKNOWN]
+_REGIONS: List[str] = [cr.value for cr in _NAMED_REGIONS]
+_TARGETS: List[str] = [t.value for t in NetDimmTargetEnum]
+_VERSIONS: List[str] = [tv.value for tv in NetDimmVersionEnum]
+_OUTLETS: List[str] = ['none', *[impl.type for impl in ALL_OUTLET_CLASSES]]
+_TIMEOUTS: Dict[str, int] = {k.value: v for k, v in NetDimm.DEFAULT_TIMEOUTS.items()}
+_CAB_TO_NAOMI_REGION: Dict[CabinetRegionEnum, NaomiRomRegionEnum] = {
+    CabinetRegionEnum.REGION_JAPAN: NaomiRomRegionEnum.REGION_JAPAN,
+    CabinetRegionEnum.REGION_USA: NaomiRomRegionEnum.REGION_USA,
+    CabinetRegionEnum.REGION_EXPORT: NaomiRomRegionEnum.REGION_EXPORT,
+    CabinetRegionEnum.REGION_KOREA: NaomiRomRegionEnum.REGION_KOREA,
+    CabinetRegionEnum.REGION_AUSTRALIA: NaomiRomRegionEnum.REGION_AUSTRALIA,
+}
+
+
+# Fields required by each outlet type, along with how to convert each of them. An outlet
+# of type "none" (or one we don't know about) is simply disabled.
+_OUTLET_SCHEMAS: Dict[str, Dict[str, Callable[[Any], object]]] = {
+    'snmp': {
+        'host': str,
+        'query_oid': str,
+        'query_on_value': int,
+        'query_off_value': int,
+        'update_oid': str,
+        'update_on_value': int,
+        'update_off_value': int,
+        'read_community': str,
+        'write_community': str,
+    },
+    'ap7900': {
+        'host': str,
+        'outlet': int,
+        'read_community': str,
+        'write_community': str,
+    },
+    'np-02': {
+        'host': str,
+        'outlet': int,
+        'community': str,
+    },
+    'np-02b': {
+        'host': str,
+        'outlet': int,
+        'username': str,
+        'password': str,
+    },
+}
+
+# The outlet config UI expects every field to be present regardless of outlet type.
+_OUTLET_DEFAULTS: Dict[str, object] = {
+    'type': 'none',
+    'read_community': "public",
+    'write_community': "private",
+    'community': "public",
+    'username': "admin",
+    'password': "admin",
+}
+
 
 class EverythingConverter(PathConverter):
     regex = '.*?'
@@ -28,37 +108,119 @@ class EverythingConverter(PathConverter):
 app.url_map.converters['filename'] = EverythingConverter
 
 
+def _normalize_filename(filename: str) -> str:
+    # Managed directories are always absolute, but the leading slash gets eaten when
+    # a filename is passed to us as part of a URL, so put it back if it's missing.
+    if not os.path.isabs(filename):
+        return "/" + filename
+    return filename
+
+
+def _json_default(obj: object) -> object:
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    # orjson does all of the encoding in native code, which matters for the larger
+    # responses such as the cabinet list and the per-cabinet game list. Routing flask's
+    # own JSON handling through here also covers request.get_json() and the tojson
+    # filter that embeds cabinet state in our pages.
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response instead of round-tripping them
+        # through a str like the default implementation does.
+        return Response(
+            orjson.dumps(self._prepare_response_obj(args, kwargs), default=_json_default, option=orjson.OPT_NON_STR_KEYS),
+            mimetype='application/json',
+        )
+
+
+_json_provider: OrjsonProvider = OrjsonProvider(app)
+app.json = _json_provider
+
+
 def jsonify(func: Callable[..., Dict[str, Any]]) -> Callable[..., Response]:
     @wraps(func)
     def decoratedfunction(*args: Any, **kwargs: Any) -> Response:
         try:
-            return flask_jsonify({**func(*args, **kwargs), "error": False})
+            return _json_provider.response({**func(*args, **kwargs), "error": False})
         except Exception as e:
             print(traceback.format_exc())
-            return flask_jsonify({
+            return _json_provider.response({
                 'error': True,
                 'message': str(e),
             })
     return decoratedfunction
 
 
+# Shared pool for fanning out filesystem work within a single request.
+_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=8)
+
+
+# The UI polls cabinets constantly and they rarely change between polls, so remember
+# the last thing we rendered for each cabinet and hand it back if nothing changed.
+_cab_dict_cache: Dict[str, Tuple[Tuple[object, ...], Dict[str, Any]]] = {}
+_cab_dict_lock: threading.Lock = threading.Lock()
+
+
+def _game_names(dirmanager: DirectoryManager, filename: str) -> Dict[str, str]:
+    names = dirmanager.game_names(filename, _NAMED_REGIONS)
+    return {region.value: name for region, name in names.items()}
+
+
+def _list_directories(directories: Sequence[str], listing: Callable[[str], List[str]]) -> List[Dict[str, Any]]:
+    # Each listing is a trip to the filesystem, so do them all at once rather than
+    # waiting on each directory in turn.
+    entries = [
+        {'name': directory, 'files': sorted(files)}
+        for directory, files in zip(directories, _executor.map(listing, directories))
+    ]
+    entries.sort(key=itemgetter('name'))
+    return entries
+
+
 def cabinet_to_dict(cab: Cabinet, dirmanager: DirectoryManager) -> Dict[str, Any]:
     status, progress = cab.state
+    outlet = cab.outlet
+    # This can end up asking the outlet over the network, so only do it once.
+    power_state = cab.power_state
+    key: Tuple[object, ...] = (
+        cab.description,
+        cab.filename,
+        cab.region,
+        cab.target,
+        cab.version,
+        status,
+        progress,
+        cab.enabled,
+        cab.controllable,
+        power_state,
+        tuple(sorted(outlet.items())) if outlet is not None else None,
+        cab.time_hack,
+        cab.skip_crc,
+        cab.skip_now_load,
+        cab.power_cycle,
+        cab.send_timeout,
+        tuple(cab.patches),
+        id(dirmanager),
+        dirmanager.version,
+    )
+    with _cab_dict_lock:
+        cached = _cab_dict_cache.get(cab.ip)
+    if cached is not None and cached[0] == key:
+        return cached[1]
 
     # Adding some defaults here is a nasty hack, but it works, so meh.
-    outlet = cab.outlet if cab.outlet is not None else {'type': 'none'}
-    if 'read_community' not in outlet:
-        outlet['read_community'] = "public"
-    if 'write_community' not in outlet:
-        outlet['write_community'] = "private"
-    if 'community' not in outlet:
-        outlet['community'] = "public"
-    if 'username' not in outlet:
-        outlet['username'] = "admin"
-    if 'password' not in outlet:
-        outlet['password'] = "admin"
+    outlet = {**_OUTLET_DEFAULTS, **(outlet or {})}
 
-    return {
+    retval: Dict[str, Any] = {
         'ip': cab.ip,
         'description': cab.description,
         'region': cab.region.value,
@@ -66,7 +228,7 @@ def cabinet_to_dict(cab: Cabinet, dirmanager: DirectoryManager) -> Dict[str, Any
         'filename': cab.filename,
         'options': sorted(
             [{'file': filename, 'name': dirmanager.game_name(filename, cab.region)} for filename in cab.patches],
-            key=lambda option: cast(str, option['name']),
+            key=itemgetter('name'),
         ),
         'target': cab.target.value,
         'version': cab.version.value,
@@ -74,7 +236,7 @@ def cabinet_to_dict(cab: Cabinet, dirmanager: DirectoryManager) -> Dict[str, Any
         'progress': progress,
         'enabled': cab.enabled,
         'controllable': cab.controllable,
-        'power_state': cab.power_state.value,
+        'power_state': power_state.value,
         'outlet': outlet,
         'time_hack': cab.time_hack,
         'skip_crc': cab.skip_crc,
@@ -82,6 +244,17 @@ def cabinet_to_dict(cab: Cabinet, dirmanager: DirectoryManager) -> Dict[str, Any
         'power_cycle': cab.power_cycle,
         'send_timeout': cab.send_timeout,
     }
+    with _cab_dict_lock:
+        _cab_dict_cache[cab.ip] = (key, retval)
+    return retval
+
+
+def _cabinets_to_dicts(cabinets: Sequence[Cabinet], dirmanager: DirectoryManager) -> List[Dict[str, Any]]:
+    # Getting a cabinet's state can mean asking its outlet over the network for the
+    # power state, so look at all of the cabinets at once instead of one by one.
+    dicts = list(_executor.map(lambda cab: cabinet_to_dict(cab, dirmanager), cabinets))
+    dicts.sort(key=itemgetter('description'))
+    return dicts
 
 
 @app.after_request
@@ -101,10 +274,7 @@ def home() -> Response:
     return make_response(
         render_template(
             'index.html',
-            cabinets=sorted(
-                [cabinet_to_dict(cab, dirman) for cab in cabman.cabinets],
-                key=lambda cab: cast(str, cab['description']),
-            ),
+            cabinets=_cabinets_to_dicts(cabman.cabinets, dirman),
         ),
         200,
     )
@@ -114,29 +284,17 @@ def home() -> Response:
 def systemconfig() -> Response:
     # We don't look up the game names here because that requires a region which is cab-specific.
     dirman = app.config['DirectoryManager']
-    roms: List[Dict[str, Any]] = []
-    for directory in dirman.directories:
-        roms.append({'name': directory, 'files': sorted(dirman.games(directory))})
     patchman = app.config['PatchManager']
-    patches: List[Dict[str, Any]] = []
-    for directory in patchman.directories:
-        patches.append({'name': directory, 'files': sorted(patchman.patches(directory))})
     sramman = app.config['SRAMManager']
-    srams: List[Dict[str, Any]] = []
-    for directory in sramman.directories:
-        srams.append({'name': directory, 'files': sorted(sramman.srams(directory))})
     settingsman = app.config['SettingsManager']
-    settings: List[Dict[str, Any]] = []
-    for directory in settingsman.directories:
-        settings.append({'name': directory, 'files': sorted(settingsman.settings(directory))})
 
     return make_response(
         render_template(
             'systemconfig.html',
-            roms=sorted(roms, key=lambda rom: cast(str, rom['name'])),
-            patches=sorted(patches, key=lambda patch: cast(str, patch['name'])),
-            settings=sorted(settings, key=lambda setting: cast(str, setting['name'])),
-            srams=sorted(srams, key=lambda sram: cast(str, sram['name'])),
+            roms=_list_directories(dirman.directories, dirman.games),
+            patches=_list_directories(patchman.directories, patchman.patches),
+            settings=_list_directories(settingsman.directories, settingsman.settings),
+            srams=_list_directories(sramman.directories, sramman.srams),
         ),
         200,
     )
@@ -145,11 +303,9 @@ def systemconfig() -> Response:
 @app.route('/config/rom/<filename:filename>')
 def romconfig(filename: str) -> Response:
     dirman = app.config['DirectoryManager']
+    filename = _normalize_filename(filename)
     directory, name = os.path.split(filename)
-    if directory not in dirman.directories and not directory.startswith('/'):
-        directory = "/" + directory
-        filename = "/" + filename
-    if directory not in dirman.directories:
+    if directory not in dirman.directories_set:
         raise Exception("This isn't a valid ROM file!")
     if name not in dirman.games(directory):
         raise Exception("This isn't a valid ROM file!")
@@ -157,13 +313,7 @@ def romconfig(filename: str) -> Response:
         render_template(
             'romconfig.html',
             filename=filename,
-            names={
-                CabinetRegionEnum.REGION_JAPAN.value: dirman.game_name(filename, CabinetRegionEnum.REGION_JAPAN),
-                CabinetRegionEnum.REGION_USA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_USA),
-                CabinetRegionEnum.REGION_EXPORT.value: dirman.game_name(filename, CabinetRegionEnum.REGION_EXPORT),
-                CabinetRegionEnum.REGION_KOREA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_KOREA),
-                CabinetRegionEnum.REGION_AUSTRALIA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_AUSTRALIA),
-            }
+            names=_game_names(dirman, filename),
         ),
         200
     )
@@ -178,11 +328,11 @@ def cabinetconfig(ip: str) -> Response:
         render_template(
             'gameconfig.html',
             cabinet=cabinet_to_dict(cabinet, dirman),
-            regions=[cr.value for cr in CabinetRegionEnum if cr != CabinetRegionEnum.REGION_UNKNOWN],
-            targets=[t.value for t in NetDimmTargetEnum],
-            versions=[tv.value for tv in NetDimmVersionEnum],
-            outlets=['none', *[impl.type for impl in ALL_OUTLET_CLASSES]],
-            timeouts={k.value: v for k, v in NetDimm.DEFAULT_TIMEOUTS.items()},
+            regions=_REGIONS,
+            targets=_TARGETS,
+            versions=_VERSIONS,
+            outlets=_OUTLETS,
+            timeouts=_TIMEOUTS,
         ),
         200
     )
@@ -193,10 +343,10 @@ def addcabinet() -> Response:
     return make_response(
         render_template(
             'addcabinet.html',
-            regions=[cr.value for cr in CabinetRegionEnum if cr != CabinetRegionEnum.REGION_UNKNOWN],
-            targets=[t.value for t in NetDimmTargetEnum],
-            versions=[tv.value for tv in NetDimmVersionEnum],
-            timeouts={k.value: v for k, v in NetDimm.DEFAULT_TIMEOUTS.items()},
+            regions=_REGIONS,
+            targets=_TARGETS,
+            versions=_VERSIONS,
+            timeouts=_TIMEOUTS,
         ),
         200
     )
@@ -206,11 +356,8 @@ def addcabinet() -> Response:
 @jsonify
 def roms() -> Dict[str, Any]:
     dirman = app.config['DirectoryManager']
-    roms: List[Dict[str, Any]] = []
-    for directory in dirman.directories:
-        roms.append({'name': directory, 'files': sorted(dirman.games(directory))})
     return {
-        'roms': sorted(roms, key=lambda rom: cast(str, rom['name'])),
+        'roms': _list_directories(dirman.directories, dirman.games),
     }
 
 
@@ -218,25 +365,18 @@ def roms() -> Dict[str, Any]:
 @jsonify
 def updaterom(filename: str) -> Dict[str, Any]:
     dirman = app.config['DirectoryManager']
+    filename = _normalize_filename(filename)
     directory, name = os.path.split(filename)
-    if directory not in dirman.directories and not directory.startswith('/'):
-        directory = "/" + directory
-        filename = "/" + filename
-    if directory not in dirman.directories:
+    if directory not in dirman.directories_set:
         raise Exception("This isn't a valid ROM file!")
     if name not in dirman.games(directory):
         raise Exception("This isn't a valid ROM file!")
-    if request.json is not None:
-        for region, name in request.json.items():
+    data = request.get_json(silent=True)
+    if data is not None:
+        for region, name in data.items():
             dirman.rename_game(filename, CabinetRegionEnum(region), name)
-        serialize_app(app)
-        return {
-            CabinetRegionEnum.REGION_JAPAN.value: dirman.game_name(filename, CabinetRegionEnum.REGION_JAPAN),
-            CabinetRegionEnum.REGION_USA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_USA),
-            CabinetRegionEnum.REGION_EXPORT.value: dirman.game_name(filename, CabinetRegionEnum.REGION_EXPORT),
-            CabinetRegionEnum.REGION_KOREA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_KOREA),
-            CabinetRegionEnum.REGION_AUSTRALIA.value: dirman.game_name(filename, CabinetRegionEnum.REGION_AUSTRALIA),
-        }
+        _save_coordinator.request_save(cabinets=False)
+        return _game_names(dirman, filename)
     else:
         raise Exception("Expected JSON data in request!")
 
@@ -253,25 +393,20 @@ def recalculateallpatches() -> Dict[str, Any]:
 @jsonify
 def applicablepatches(filename: str) -> Dict[str, Any]:
     patchman = app.config['PatchManager']
-    directories = set(patchman.directories)
-    patches_by_directory: Dict[str, List[str]] = {}
-    try:
-        patches = patchman.patches_for_game(filename)
-    except FileNotFoundError:
-        if not filename.startswith('/'):
-            filename = "/" + filename
-        patches = patchman.patches_for_game(filename)
+    directories = patchman.directories_set
+    patches_by_directory: DefaultDict[str, List[str]] = defaultdict(list)
+    patches = patchman.patches_for_game(_normalize_filename(filename))
     for patch in patches:
-        dirname, filename = os.path.split(patch)
+        # These were all built by joining a managed directory and a filename, so we
+        # can split on the last separator without going through os.path.split().
+        dirname, _, filename = patch.rpartition(os.sep)
         if dirname not in directories:
             raise Exception("Expected all patches to be inside managed directories!")
-        if dirname not in patches_by_directory:
-            patches_by_directory[dirname] = []
         patches_by_directory[dirname].append(filename)
     return {
         'patches': sorted(
             [{'name': dirname, 'files': sorted(patches_by_directory[dirname])} for dirname in patches_by_directory],
-            key=lambda patch: cast(str, patch['name']),
+            key=itemgetter('name'),
         )
     }
 
@@ -280,25 +415,18 @@ def applicablepatches(filename: str) -> Dict[str, Any]:
 @jsonify
 def applicablesettings(filename: str) -> Dict[str, Any]:
     settingsman = app.config['SettingsManager']
-    directories = set(settingsman.directories)
-    settings_by_directory: Dict[str, List[str]] = {}
-    try:
-        settings = settingsman.settings_for_game(filename)
-    except FileNotFoundError:
-        if not filename.startswith('/'):
-            filename = "/" + filename
-        settings = settingsman.settings_for_game(filename)
+    directories = settingsman.directories_set
+    settings_by_directory: DefaultDict[str, List[str]] = defaultdict(list)
+    settings = settingsman.settings_for_game(_normalize_filename(filename))
     for setting in settings:
-        dirname, filename = os.path.split(setting)
+        dirname, _, filename = setting.rpartition(os.sep)
         if dirname not in directories:
             raise Exception("Expected all settings to be inside managed directories!")
-        if dirname not in settings_by_directory:
-            settings_by_directory[dirname] = []
         settings_by_directory[dirname].append(filename)
     return {
         'settings': sorted(
             [{'name': dirname, 'files': sorted(settings_by_directory[dirname])} for dirname in settings_by_directory],
-            key=lambda patch: cast(str, patch['name']),
+            key=itemgetter('name'),
         )
     }
 
@@ -306,9 +434,7 @@ def applicablesettings(filename: str) -> Dict[str, Any]:
 @app.route('/patches/<filename:filename>', methods=['DELETE'])
 def recalculateapplicablepatches(filename: str) -> Response:
     patchman = app.config['PatchManager']
-    patchman.recalculate(filename)
-    if not filename.startswith('/'):
-        filename = "/" + filename
+    filename = _normalize_filename(filename)
     patchman.recalculate(filename)
     return applicablepatches(filename)
 
@@ -317,11 +443,8 @@ def recalculateapplicablepatches(filename: str) -> Response:
 @jsonify
 def patches() -> Dict[str, Any]:
     patchman = app.config['PatchManager']
-    patches: List[Dict[str, Any]] = []
-    for directory in patchman.directories:
-        patches.append({'name': directory, 'files': sorted(patchman.patches(directory))})
     return {
-        'patches': sorted(patches, key=lambda direntry: cast(str, direntry['name'])),
+        'patches': _list_directories(patchman.directories, patchman.patches),
     }
 
 
@@ -329,11 +452,8 @@ def patches() -> Dict[str, Any]:
 @jsonify
 def srams() -> Dict[str, Any]:
     sramman = app.config['SRAMManager']
-    srams: List[Dict[str, Any]] = []
-    for directory in sramman.directories:
-        srams.append({'name': directory, 'files': sorted(sramman.srams(directory))})
     return {
-        'srams': sorted(srams, key=lambda direntry: cast(str, direntry['name'])),
+        'srams': _list_directories(sramman.directories, sramman.srams),
     }
 
 
@@ -349,25 +469,18 @@ def recalculateallsrams() -> Dict[str, Any]:
 @jsonify
 def applicablesrams(filename: str) -> Dict[str, Any]:
     sramman = app.config['SRAMManager']
-    directories = set(sramman.directories)
-    srams_by_directory: Dict[str, List[str]] = {}
-    try:
-        srams = sramman.srams_for_game(filename)
-    except FileNotFoundError:
-        if not filename.startswith('/'):
-            filename = "/" + filename
-        srams = sramman.srams_for_game(filename)
+    directories = sramman.directories_set
+    srams_by_directory: DefaultDict[str, List[str]] = defaultdict(list)
+    srams = sramman.srams_for_game(_normalize_filename(filename))
     for sram in srams:
-        dirname, filename = os.path.split(sram)
+        dirname, _, filename = sram.rpartition(os.sep)
         if dirname not in directories:
             raise Exception("Expected all SRAM files to be inside managed directories!")
-        if dirname not in srams_by_directory:
-            srams_by_directory[dirname] = []
         srams_by_directory[dirname].append(filename)
     return {
         'srams': sorted(
             [{'name': dirname, 'files': sorted(srams_by_directory[dirname])} for dirname in srams_by_directory],
-            key=lambda sram: cast(str, sram['name']),
+            key=itemgetter('name'),
         )
     }
 
@@ -375,9 +488,7 @@ def applicablesrams(filename: str) -> Dict[str, Any]:
 @app.route('/srams/<filename:filename>', methods=['DELETE'])
 def recalculateapplicablesrams(filename: str) -> Response:
     sramman = app.config['SRAMManager']
-    sramman.recalculate(filename)
-    if not filename.startswith('/'):
-        filename = "/" + filename
+    filename = _normalize_filename(filename)
     sramman.recalculate(filename)
     return applicablesrams(filename)
 
@@ -386,11 +497,8 @@ def recalculateapplicablesrams(filename: str) -> Response:
 @jsonify
 def settings() -> Dict[str, Any]:
     settingsman = app.config['SettingsManager']
-    settings: List[Dict[str, Any]] = []
-    for directory in settingsman.directories:
-        settings.append({'name': directory, 'files': sorted(settingsman.settings(directory))})
     return {
-        'settings': sorted(settings, key=lambda direntry: cast(str, direntry['name'])),
+        'settings': _list_directories(settingsman.directories, settingsman.settings),
     }
 
 
@@ -400,10 +508,7 @@ def cabinets() -> Dict[str, Any]:
     cabman = app.config['CabinetManager']
     dirman = app.config['DirectoryManager']
     return {
-        'cabinets': sorted(
-            [cabinet_to_dict(cab, dirman) for cab in cabman.cabinets],
-            key=lambda cab: cast(str, cab['description']),
-        ),
+        'cabinets': _cabinets_to_dicts(cabman.cabinets, dirman),
     }
 
 
@@ -419,7 +524,8 @@ def cabinet(ip: str) -> Dict[str, Any]:
 @app.route('/cabinets/<ip>', methods=['PUT'])
 @jsonify
 def createcabinet(ip: str) -> Dict[str, Any]:
-    if request.json is None:
+    data = request.get_json(silent=True)
+    if data is None:
         raise Exception("Expected JSON data in request!")
     cabman = app.config['CabinetManager']
     dirman = app.config['DirectoryManager']
@@ -428,57 +534,59 @@ def createcabinet(ip: str) -> Dict[str, Any]:
     # As a convenience, start with all game selectable instad of none.
     roms: List[str] = []
     for directory in dirman.directories:
-        roms.extend(os.path.join(directory, filename) for filename in dirman.games(directory))
+        roms.extend(f"{directory}{os.sep}{filename}" for filename in dirman.games(directory))
     new_cabinet = Cabinet(
         ip=ip,
-        region=CabinetRegionEnum(request.json['region']),
-        description=request.json['description'],
+        region=CabinetRegionEnum(data['region']),
+        description=data['description'],
         filename=None,
         patches={rom: [] for rom in roms},
         settings={rom: None for rom in roms},
         srams={rom: None for rom in roms},
         outlet=None,
-        target=NetDimmTargetEnum(request.json['target']),
-        version=NetDimmVersionEnum(request.json['version']),
+        target=NetDimmTargetEnum(data['target']),
+        version=NetDimmVersionEnum(data['version']),
         enabled=True,
-        time_hack=request.json['time_hack'],
+        time_hack=data['time_hack'],
         skip_crc=False,
         skip_now_load=False,
         power_cycle=False,
-        send_timeout=request.json['send_timeout'] or None,
+        send_timeout=data['send_timeout'] or None,
     )
     cabman.add_cabinet(new_cabinet)
-    serialize_app(app)
+    _save_coordinator.request_save(config=False)
     return cabinet_to_dict(new_cabinet, dirman)
 
 
 @app.route('/cabinets/<ip>', methods=['POST'])
 @jsonify
 def updatecabinet(ip: str) -> Dict[str, Any]:
-    if request.json is None:
+    data = request.get_json(silent=True)
+    if data is None:
         raise Exception("Expected JSON data in request!")
     cabman = app.config['CabinetManager']
     dirman = app.config['DirectoryManager']
     cabman.update_cabinet(
         ip,
-        region=CabinetRegionEnum(request.json['region']),
-        description=request.json['description'],
-        target=NetDimmTargetEnum(request.json['target']),
-        version=NetDimmVersionEnum(request.json['version']),
-        enabled=request.json['enabled'],
-        time_hack=request.json['time_hack'],
-        skip_crc=request.json['skip_crc'],
-        skip_now_load=request.json['skip_now_load'],
-        send_timeout=request.json['send_timeout'] or None,
+        region=CabinetRegionEnum(data['region']),
+        description=data['description'],
+        target=NetDimmTargetEnum(data['target']),
+        version=NetDimmVersionEnum(data['version']),
+        enabled=data['enabled'],
+        time_hack=data['time_hack'],
+        skip_crc=data['skip_crc'],
+        skip_now_load=data['skip_now_load'],
+        send_timeout=data['send_timeout'] or None,
     )
-    serialize_app(app)
+    _save_coordinator.request_save(config=False)
     return cabinet_to_dict(cabman.cabinet(ip), dirman)
 
 
 @app.route('/cabinets/<ip>/outlet', methods=['POST'])
 @jsonify
 def updateoutlet(ip: str) -> Dict[str, Any]:
-    if request.json is None:
+    data = request.get_json(silent=True)
+    if data is None:
         raise Exception("Expected JSON data in request!")
 
     # Unfortunately we must do a decent amount of validation here, in order
@@ -487,126 +595,28 @@ def updateoutlet(ip: str) -> Dict[str, Any]:
     # into it, but that couples the outlet implementations to the frontend.
     # Sigh, all software sucks, lmao.
     config: Optional[Dict[str, object]] = None
-    data = request.json.get('outlet', {})
-    if data.get('type', 'none') == 'none':
-        # This is a disabled outlet.
-        config = None
-    elif data.get('type') == 'snmp':
-        # SNMP configuration
+    outlet = data.get('outlet', {})
+    schema = _OUTLET_SCHEMAS.get(outlet.get('type', 'none'))
+    if schema is not None:
+        # Every field is required, and a field that won't convert to the right
+        # type means the whole config is invalid, same as a missing one.
         try:
-            host = str(data['host']) if 'host' in data else None
-            query_oid = str(data['query_oid']) if 'query_oid' in data else None
-            query_on_value = int(data['query_on_value']) if 'query_on_value' in data else None
-            query_off_value = int(data['query_off_value']) if 'query_off_value' in data else None
-            update_oid = str(data['update_oid']) if 'update_oid' in data else None
-            update_on_value = int(data['update_on_value']) if 'update_on_value' in data else None
-            update_off_value = int(data['update_off_value']) if 'update_off_value' in data else None
-            read_community = str(data['read_community']) if 'read_community' in data else None
-            write_community = str(data['write_community']) if 'write_community' in data else None
-        except (TypeError, ValueError):
-            host = None
-            query_oid = None
-            query_on_value = None
-            query_off_value = None
-            update_oid = None
-            update_on_value = None
-            update_off_value = None
-            read_community = None
-            write_community = None
-
-        if (
-            host is not None and
-            query_oid is not None and
-            query_on_value is not None and
-            query_off_value is not None and
-            update_oid is not None and
-            update_on_value is not None and
-            update_off_value is not None and
-            read_community is not None and
-            write_community is not None
-        ):
             config = {
-                'type': 'snmp',
-                'host': host,
-                'query_oid': query_oid,
-                'query_on_value': query_on_value,
-                'query_off_value': query_off_value,
-                'update_oid': update_oid,
-                'update_on_value': update_on_value,
-                'update_off_value': update_off_value,
-                'read_community': read_community,
-                'write_community': write_community,
-            }
-    elif data.get('type') == 'ap7900':
-        # AP7900 configuration.
-        try:
-            host = str(data['host']) if 'host' in data else None
-            outlet = int(data['outlet']) if 'outlet' in data else None
-            read_community = str(data['read_community']) if 'read_community' in data else None
-            write_community = str(data['write_community']) if 'write_community' in data else None
-        except (TypeError, ValueError):
-            host = None
-            outlet = None
-            read_community = None
-            write_community = None
-
-        if host is not None and outlet is not None and read_community is not None and write_community is not None:
-            config = {
-                'type': 'ap7900',
-                'host': host,
-                'outlet': outlet,
-                'read_community': read_community,
-                'write_community': write_community,
-            }
-    elif data.get('type') == 'np-02':
-        # NP-02 configuration.
-        try:
-            host = str(data['host']) if 'host' in data else None
-            outlet = int(data['outlet']) if 'outlet' in data else None
-            community = str(data['community']) if 'community' in data else None
-        except (TypeError, ValueError):
-            host = None
-            outlet = None
-            community = None
-
-        if host is not None and outlet is not None and community is not None:
-            config = {
-                'type': 'np-02',
-                'host': host,
-                'outlet': outlet,
-                'community': community,
-            }
-    elif data.get('type') == 'np-02b':
-        # NP-02B configuration.
-        try:
-            host = str(data['host']) if 'host' in data else None
-            outlet = int(data['outlet']) if 'outlet' in data else None
-            username = str(data['username']) if 'username' in data else None
-            password = str(data['password']) if 'password' in data else None
-        except (TypeError, ValueError):
-            host = None
-            outlet = None
-            username = None
-            password = None
-
-        if host is not None and outlet is not None and username is not None and password is not None:
-            config = {
-                'type': 'np-02b',
-                'host': host,
-                'outlet': outlet,
-                'username': username,
-                'password': password,
+                'type': outlet['type'],
+                **{field: conversion(outlet[field]) for field, conversion in schema.items()},
             }
+        except (KeyError, TypeError, ValueError):
+            config = None
 
     cabman = app.config['CabinetManager']
     dirman = app.config['DirectoryManager']
     cabman.update_cabinet(
         ip,
         outlet=config,
-        controllable=bool(request.json['controllable']),
-        power_cycle=bool(request.json['power_cycle']),
+        controllable=bool(data['controllable']),
+        power_cycle=bool(data['power_cycle']),
     )
-    serialize_app(app)
+    _save_coordinator.request_save(config=False)
     return cabinet_to_dict(cabman.cabinet(ip), dirman)
 
 
@@ -622,8 +632,9 @@ def fetchpower(ip: str) -> Dict[str, Any]:
 @jsonify
 def updatepower(ip: str, state: str) -> Dict[str, Any]:
     admin_override = False
-    if request.json is not None:
-        if 'admin' in request.json and request.json['admin']:
+    data = request.get_json(silent=True)
+    if data is not None:
+        if 'admin' in data and data['admin']:
             admin_override = True
 
     if state not in {"on", "off"}:
@@ -644,7 +655,9 @@ def updatepower(ip: str, state: str) -> Dict[str, Any]:
 def removecabinet(ip: str) -> Dict[str, Any]:
     cabman = app.config['CabinetManager']
     cabman.remove_cabinet(ip)
-    serialize_app(app)
+    with _cab_dict_lock:
+        _cab_dict_cache.pop(ip, None)
+    _save_coordinator.request_save(config=False)
     return {}
 
 
@@ -676,81 +689,89 @@ def romsforcabinet(ip: str) -> Dict[str, Any]:
     settingsman = app.config['SettingsManager']
     cabinet = cabman.cabinet(ip)
 
-    roms: List[Dict[str, Any]] = []
+    # ROM directories are always absolute and normalized, so there's no need for
+    # os.path.join() to work out how to glue the filenames on.
+    full_filenames: List[str] = []
     for directory in dirman.directories:
-        for filename in dirman.games(directory):
-            full_filename = os.path.join(directory, filename)
-            patches = patchman.patches_for_game(full_filename)
-            patches = sorted(
-                [
-                    {
-                        'file': patch,
-                        'type': 'patch',
-                        'enabled': patch in cabinet.patches.get(full_filename, []),
-                        'name': patchman.patch_name(patch),
-                    }
-                    for patch in patches
-                ],
-                key=lambda patch: cast(str, patch['name']),
-            )
+        full_filenames.extend(f"{directory}{os.sep}{filename}" for filename in dirman.games(directory))
 
-            # Calculate whether we are allowed to modify settings or not, and
-            # if so, is there a setting enabled for this game.
-            if cabinet.target == NetDimmTargetEnum.TARGET_NAOMI:
-                naomi_region = {
-                    CabinetRegionEnum.REGION_JAPAN: NaomiRomRegionEnum.REGION_JAPAN,
-                    CabinetRegionEnum.REGION_USA: NaomiRomRegionEnum.REGION_USA,
-                    CabinetRegionEnum.REGION_EXPORT: NaomiRomRegionEnum.REGION_EXPORT,
-                    CabinetRegionEnum.REGION_KOREA: NaomiRomRegionEnum.REGION_KOREA,
-                    CabinetRegionEnum.REGION_AUSTRALIA: NaomiRomRegionEnum.REGION_AUSTRALIA,
-                }.get(cabinet.region, NaomiRomRegionEnum.REGION_JAPAN)
-                settings, present = settingsman.get_naomi_settings(
-                    full_filename,
-                    cabinet.settings.get(full_filename, None),
-                    patches=cabinet.patches.get(full_filename, []),
-                    region=naomi_region,
-                )
-                if settings:
-                    patches.append({
-                        'file': 'eeprom',
-                        'type': 'settings',
-                        'enabled': present,
-                        'settings': settings.to_json(),
-                    })
-
-                srams = sramman.srams_for_game(full_filename)
-                if srams:
-                    activesram = cabinet.srams.get(full_filename, None)
-                    patches.append({
-                        'file': 'sram',
-                        'type': 'sram',
-                        'active': activesram or "",
-                        'choices': [
-                            {
-                                "v": "",
-                                "t": "No SRAM File",
-                            },
-                            *sorted([{"v": f, "t": sramman.sram_name(f)} for f in srams], key=lambda e: cast(str, e['t']))
-                        ],
-                    })
-
-            roms.append({
-                'file': full_filename,
-                'name': dirman.game_name(full_filename, cabinet.region),
-                'enabled': full_filename in cabinet.patches,
-                'patches': patches,
-            })
-    return {'games': sorted(roms, key=lambda rom: cast(str, rom['name']))}
+    # Look up everything applicable to every game in one go, so the managers only
+    # need to scan their directories once.
+    patches_by_game = patchman.patches_for_games(full_filenames)
+    if cabinet.target == NetDimmTargetEnum.TARGET_NAOMI:
+        srams_by_game = sramman.srams_for_games(full_filenames)
+    else:
+        srams_by_game = {}
+
+    roms: List[Dict[str, Any]] = []
+    for full_filename in full_filenames:
+        enabled_patches = set(cabinet.patches.get(full_filename, ()))
+        patches = [
+            {
+                'file': patch,
+                'type': 'patch',
+                'enabled': patch in enabled_patches,
+                'name': patchman.patch_name(patch),
+            }
+            for patch in patches_by_game[full_filename]
+        ]
+        patches.sort(key=itemgetter('name'))
+
+        # Calculate whether we are allowed to modify settings or not, and
+        # if so, is there a setting enabled for this game.
+        if cabinet.target == NetDimmTargetEnum.TARGET_NAOMI:
+            naomi_region = _CAB_TO_NAOMI_REGION.get(cabinet.region, NaomiRomRegionEnum.REGION_JAPAN)
+            settings, present = settingsman.get_naomi_settings(
+                full_filename,
+                cabinet.settings.get(full_filename, None),
+                patches=cabinet.patches.get(full_filename, []),
+                region=naomi_region,
+            )
+            if settings:
+                patches.append({
+                    'file': 'eeprom',
+                    'type': 'settings',
+                    'enabled': present,
+                    'settings': settings.to_json(),
+                })
+
+            srams = srams_by_game[full_filename]
+            if srams:
+                activesram = cabinet.srams.get(full_filename, None)
+                choices = [{"v": f, "t": sramman.sram_name(f)} for f in srams]
+                choices.sort(key=itemgetter('t'))
+                patches.append({
+                    'file': 'sram',
+                    'type': 'sram',
+                    'active': activesram or "",
+                    'choices': [
+                        {
+                            "v": "",
+                            "t": "No SRAM File",
+                        },
+                        *choices,
+                    ],
+                })
+
+        roms.append({
+            'file': full_filename,
+            'name': dirman.game_name(full_filename, cabinet.region),
+            'enabled': full_filename in cabinet.patches,
+            'patches': patches,
+        })
+    roms.sort(key=itemgetter('name'))
+    return {'games': roms}
 
 
 @app.route('/cabinets/<ip>/games', methods=['POST'])
 def updateromsforcabinet(ip: str) -> Response:
-    if request.json is None:
+    data = request.get_json(silent=True)
+    if data is None:
         raise Exception("Expected JSON data in request!")
     cabman = app.config['CabinetManager']
     settingsman = app.config['SettingsManager']
     cabinet = cabman.cabinet(ip)
-    for game in request.json['games']:
+    for game in data['games']:
         if not game['enabled']:
             if game['file'] in cabinet.patches:
                 del cabinet.patches[game['file']]
@@ -784,18 +805,26 @@ def updateromsforcabinet(ip: str) -> Response:
             else:
                 cabinet.settings[game['file']] = None
                 cabinet.srams[game['file']] = None
-    serialize_app(app)
+    _save_coordinator.request_save(config=False)
     return romsforcabinet(ip)
 
 
 @app.route('/cabinets/<ip>/filename', methods=['POST'])
 def changegameforcabinet(ip: str) -> Response:
-    if request.json is None:
+    data = request.get_json(silent=True)
+    if data is None:
         raise Exception("Expected JSON data in request!")
+    # Make sure we got what we expect before it gets anywhere near the cabinet, since
+    # whatever we set here gets saved and later sent to the net dimm.
+    if not isinstance(data, dict) or 'filename' not in data:
+        raise Exception("Expected valid filename in request!")
+    filename = data['filename']
+    if filename is not None and not isinstance(filename, str):
+        raise Exception("Expected valid filename in request!")
     cabman = app.config['CabinetManager']
     cab = cabman.cabinet(ip)
-    cab.filename = request.json['filename']
-    serialize_app(app)
+    cab.filename = filename
+    _save_coordinator.request_save(config=False)
     return cabinet(ip)
 
 
@@ -803,12 +832,39 @@ class AppException(Exception):
     pass
 
 
+def _as_dir_list(config_file: str, directory_or_list: object, setting: str) -> List[str]:
+    if isinstance(directory_or_list, str):
+        return [directory_or_list]
+    elif isinstance(directory_or_list, list):
+        return directory_or_list
+    else:
+        raise AppException(f"Invalid YAML file format for {config_file}, expected directory or list of directories for {setting} setting!")
+
+
+def _is_dir(path: str) -> bool:
+    # A single stat tells us both that it exists and that it's a directory.
+    try:
+        return S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _resolve_and_validate_dirs(config_file: str, config_dir: str, directories: List[str]) -> List[str]:
+    # Allow use of relative paths (relative to config file). Check them all at once since
+    # ROMs often live on network shares where every stat is a round trip.
+    resolved = [os.path.abspath(os.path.join(config_dir, d)) for d in directories]
+    for directory, isdir in zip(resolved, _executor.map(_is_dir, resolved)):
+        if not isdir:
+            raise AppException(f"Invalid YAML file format for {config_file}, {directory} is not a directory!")
+    return resolved
+
+
 def spawn_app(config_file: str, debug: bool = False) -> Flask:
     if debug and not os.environ.get('WERKZEUG_RUN_MAIN'):
         return app
 
     with open(config_file, "r") as fp:
-        data = yaml.safe_load(fp)
+        data = yaml.load(fp, Loader=_YamlLoader)
     config_dir = os.path.abspath(os.path.dirname(config_file))
 
     if not isinstance(data, dict):
@@ -824,39 +880,15 @@ def spawn_app(config_file: str, debug: bool = False) -> Flask:
 
     if 'rom_directory' not in data:
         raise AppException(f"Invalid YAML file format for {config_file}, missing rom directory setting!")
-    directory_or_list = data['rom_directory']
-    if isinstance(directory_or_list, str):
-        directories = [directory_or_list]
-    elif isinstance(directory_or_list, list):
-        directories = directory_or_list
-    else:
-        raise AppException(f"Invalid YAML file format for {config_file}, expected directory or list of directories for rom directory setting!")
-
-    # Allow use of relative paths (relative to config file).
-    directories = [os.path.abspath(os.path.join(config_dir, d)) for d in directories]
-    for directory in directories:
-        if not os.path.isdir(directory):
-            raise AppException(f"Invalid YAML file format for {config_file}, {directory} is not a directory!")
+    directories = _resolve_and_validate_dirs(config_file, config_dir, _as_dir_list(config_file, data['rom_directory'], "rom directory"))
 
     if 'patch_directory' not in data:
         data['patch_directory'] = 'patches'
-    directory_or_list = data['patch_directory']
-    if isinstance(directory_or_list, str):
-        patches = [directory_or_list]
-    elif isinstance(directory_or_list, list):
-        patches = directory_or_list
-    else:
-        raise AppException(f"Invalid YAML file format for {config_file}, expected directory or list of directories for patch directory setting!")
+    patches = _resolve_and_validate_dirs(config_file, config_dir, _as_dir_list(config_file, data['patch_directory'], "patch directory"))
 
     if 'sram_directory' not in data:
         data['sram_directory'] = 'srams'
-    directory_or_list = data['sram_directory']
-    if isinstance(directory_or_list, str):
-        srams = [directory_or_list]
-    elif isinstance(directory_or_list, list):
-        srams = directory_or_list
-    else:
-        raise AppException(f"Invalid YAML file format for {config_file}, expected directory or list of directories for sram directory setting!")
+    srams = _as_dir_list(config_file, data['sram_directory'], "sram directory")
 
     if 'settings_directory' not in data:
         raise AppException(f"Invalid YAML file format for {config_file}, missing naomi settings directory setting!")
@@ -864,12 +896,6 @@ def spawn_app(config_file: str, debug: bool = False) -> Flask:
     if not isinstance(naomi_settings, str):
         raise AppException(f"Invalid YAML file format for {config_file}, expected directory for naomi settings directory setting!")
 
-    # Allow use of relative paths (relative to config file).
-    patches = [os.path.abspath(os.path.join(config_dir, d)) for d in patches]
-    for patch in patches:
-        if not os.path.isdir(patch):
-            raise AppException(f"Invalid YAML file format for {config_file}, {patch} is not a directory!")
-
     if 'filenames' in data and isinstance(data, dict):
         checksums = data['filenames']
     else:
@@ -882,22 +908,124 @@ def spawn_app(config_file: str, debug: bool = False) -> Flask:
     app.config['SettingsManager'] = SettingsManager(os.path.abspath(naomi_settings))
     app.config['config_file'] = os.path.abspath(config_file)
     app.config['cabinet_file'] = cabinet_file
+    # Saves happen a lot more often than startup, so work out where the cabinet file gets
+    # written to once here instead of every time.
+    app.config['cabinet_file_abs'] = os.path.join(config_dir, cabinet_file)
 
     return app
 
 
-def serialize_app(app: Flask) -> None:
-    config = {
-        'cabinet_config': app.config['cabinet_file'],
-        'rom_directory': app.config['DirectoryManager'].directories,
-        'patch_directory': app.config['PatchManager'].directories,
-        'sram_directory': app.config['SRAMManager'].directories,
-        'settings_directory': app.config['SettingsManager'].naomi_directory,
-        'filenames': app.config['DirectoryManager'].checksums,
-    }
-    with open(app.config['config_file'], "w") as fp:
-        yaml.dump(config, fp)
-
-    config_dir = os.path.abspath(os.path.dirname(app.config['config_file']))
-    cabinet_file = os.path.join(config_dir, app.config['cabinet_file'])
-    app.config['CabinetManager'].to_yaml(cabinet_file)
+def _content_hash(data: object) -> bytes:
+    return hashlib.blake2b(
+        orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS),
+        digest_size=16,
+    ).digest()
+
+
+def serialize_app(app: Flask, *, config: bool = True, cabinets: bool = True) -> None:
+    # Grab a copy of everything we're about to write first, so the (comparatively slow)
+    # YAML writing works from a consistent view and doesn't race with requests changing
+    # things. Most changes only touch one of the two files, so only write what we need.
+    config_data: Optional[Dict[str, object]] = None
+    if config:
+        config_data = {
+            'cabinet_config': app.config['cabinet_file'],
+            'rom_directory': app.config['DirectoryManager'].directories,
+            'patch_directory': app.config['PatchManager'].directories,
+            'sram_directory': app.config['SRAMManager'].directories,
+            'settings_directory': app.config['SettingsManager'].naomi_directory,
+            'filenames': app.config['DirectoryManager'].checksums,
+        }
+    cabinet_data: Optional[Dict[str, Dict[str, object]]] = None
+    if cabinets:
+        cabinet_data = app.config['CabinetManager'].to_dict()
+
+    # Plenty of requests end up setting things to what they already were, so remember
+    # what we last wrote and leave the file alone if nothing actually changed.
+    if config_data is not None:
+        config_hash = _content_hash(config_data)
+        if config_hash != app.config.get('config_hash'):
+            with atomic_write(app.config['config_file']) as fp:
+                yaml.dump(config_data, fp, Dumper=_YamlDumper)
+            app.config['config_hash'] = config_hash
+
+    if cabinet_data is not None:
+        cabinet_hash = _content_hash(cabinet_data)
+        if cabinet_hash != app.config.get('cabinet_hash'):
+            CabinetManager.write_yaml(cabinet_data, app.config['cabinet_file_abs'])
+            app.config['cabinet_hash'] = cabinet_hash
+
+
+class _SaveCoordinator:
+    # How long things must be quiet after a change before writing, so that a burst of
+    # updates from the UI only results in one write. A steady stream of changes will
+    # still be written out at least every MAX_DELAY_SECONDS.
+    DEBOUNCE_SECONDS: float = 0.5
+    MAX_DELAY_SECONDS: float = 2.0
+
+    def __init__(self, app: Flask) -> None:
+        self.__app = app
+        self.__pending: threading.Event = threading.Event()
+        self.__changed: threading.Event = threading.Event()
+        self.__dirty_lock: threading.Lock = threading.Lock()
+        self.__config_dirty: bool = False
+        self.__cabinets_dirty: bool = False
+        self.__save_lock: threading.Lock = threading.Lock()
+        self.__thread_lock: threading.Lock = threading.Lock()
+        self.__thread: Optional[threading.Thread] = None
+
+    def request_save(self, *, config: bool = True, cabinets: bool = True) -> None:
+        # Writing the config out means touching the disk, so do it in the background
+        # instead of making the request that caused the change wait on it.
+        with self.__thread_lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__save_thread, daemon=True)
+                self.__thread.start()
+        with self.__dirty_lock:
+            self.__config_dirty = self.__config_dirty or config
+            self.__cabinets_dirty = self.__cabinets_dirty or cabinets
+        self.__changed.set()
+        self.__pending.set()
+
+    def flush(self) -> None:
+        with self.__save_lock:
+            if self.__pending.is_set():
+                self.__pending.clear()
+                with self.__dirty_lock:
+                    config, cabinets = self.__config_dirty, self.__cabinets_dirty
+                    self.__config_dirty = False
+                    self.__cabinets_dirty = False
+                try:
+                    serialize_app(self.__app, config=config, cabinets=cabinets)
+                except Exception:
+                    # The client was already told this worked, so don't lose track of
+                    # what still needs writing just because the disk said no this time.
+                    with self.__dirty_lock:
+                        self.__config_dirty = self.__config_dirty or config
+                        self.__cabinets_dirty = self.__cabinets_dirty or cabinets
+                    self.__pending.set()
+                    raise
+
+    def __save_thread(self) -> None:
+        while True:
+            self.__pending.wait()
+
+            # Keep pushing the write back for as long as changes keep coming in.
+            start = time.monotonic()
+            while True:
+                self.__changed.clear()
+                if not self.__changed.wait(self.DEBOUNCE_SECONDS):
+                    break
+                if time.monotonic() - start >= self.MAX_DELAY_SECONDS:
+                    break
+
+            try:
+                self.flush()
+            except Exception:
+                print(traceback.format_exc())
+                # Give whatever went wrong a chance to clear up before trying again.
+                time.sleep(self.MAX_DELAY_SECONDS)
+
+
+_save_coordinator = _SaveCoordinator(app)
+atexit.register(_save_coordinator.flush)
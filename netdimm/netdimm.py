@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # Triforce Netfirm Toolbox, put into the public domain.
 # Please attribute properly, but only if you want.
+import mmap
 import os
 import sys
 import socket
@@ -98,10 +99,15 @@ class NetDimm:
     }
 
     @staticmethod
-    def crc(data: Union[bytes, FileBytes]) -> int:
+    def crc(data: Union[bytes, FileBytes, mmap.mmap]) -> int:
         crc: int = 0
         if isinstance(data, bytes):
             crc = zlib.crc32(data, crc)
+        elif isinstance(data, mmap.mmap):
+            # A mapped file is already one contiguous buffer, so hand the whole thing
+            # to zlib in one go. It releases the GIL while it works and the kernel
+            # pages the file in as needed, so this won't load it all at once.
+            crc = zlib.crc32(data, crc)
         elif isinstance(data, FileBytes):
             # Do this in chunks so we don't accidentally load the whole file.
             for offset in range(0, len(data), 0x8000):
@@ -150,7 +156,7 @@ class NetDimm:
 
     def send(
         self,
-        data: Union[bytes, FileBytes],
+        data: Union[bytes, FileBytes, mmap.mmap],
         key: Optional[bytes] = None,
         disable_crc_check: bool = False,
         disable_now_loading: bool = False,
@@ -694,7 +700,7 @@ class NetDimm:
         # the crc over the first 28 bytes.
         self.__send_packet(NetDimmPacket(0x19, 0x00, struct.pack("<III", crc & 0xFFFFFFFF, length, 0)))
 
-    def __upload_file(self, data: Union[bytes, FileBytes], key: Optional[bytes], progress_callback: Optional[Callable[[int, int], None]]) -> None:
+    def __upload_file(self, data: Union[bytes, FileBytes, mmap.mmap], key: Optional[bytes], progress_callback: Optional[Callable[[int, int], None]]) -> None:
         # upload a file into DIMM memory, and optionally encrypt for the given key.
         # note that the re-encryption is obsoleted by just setting a zero-key, which
         # is a magic to disable the decryption.
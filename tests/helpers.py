@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+from typing import Union
+
+
+class TempDirTestCase(unittest.TestCase):
+    """
+    A test case that gets a fresh scratch directory for every test, along with
+    helpers for laying out the directories and files a manager should look at.
+    """
+
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def mkdir(self, name: str) -> str:
+        path = os.path.join(self.tempdir.name, name)
+        os.mkdir(path)
+        return path
+
+    def write(self, name: str, data: Union[str, bytes]) -> str:
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, "wb") as fp:
+            fp.write(data.encode("ascii") if isinstance(data, str) else data)
+        return path
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import yaml
+from typing import List, Tuple
+from unittest.mock import MagicMock, patch
+
+# We import internal stuff here since we don't want to test the public
+# interfaces.
+from netboot.cabinet import CabinetRegionEnum
+from netboot.web.app import _SaveCoordinator, spawn_app, serialize_app
+
+
+class TestSerializeApp(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        for directory in ["roms", "patches", "srams", "settings"]:
+            os.mkdir(os.path.join(self.tempdir.name, directory))
+        self.rom = os.path.join(self.tempdir.name, "roms", "game.bin")
+        with open(self.rom, "wb") as bfp:
+            bfp.write(b"\x01" * 0x100)
+
+        self.config_file = os.path.join(self.tempdir.name, "config.yaml")
+        self.cabinet_file = os.path.join(self.tempdir.name, "cabinets.yaml")
+        with open(self.config_file, "w") as fp:
+            yaml.dump(
+                {
+                    'cabinet_config': self.cabinet_file,
+                    'rom_directory': 'roms',
+                    'patch_directory': 'patches',
+                    'sram_directory': 'srams',
+                    'settings_directory': os.path.join(self.tempdir.name, 'settings'),
+                },
+                fp,
+            )
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def inodes(self) -> Tuple[int, int]:
+        # Every write swaps a new file into place, so a changed inode means a rewrite.
+        return (os.stat(self.config_file).st_ino, os.stat(self.cabinet_file).st_ino)
+
+    def test_unchanged_snapshot_is_not_rewritten(self) -> None:
+        app = spawn_app(self.config_file)
+        serialize_app(app)
+        written = self.inodes()
+
+        serialize_app(app)
+        self.assertEqual(written, self.inodes())
+
+    def test_only_changed_file_is_rewritten(self) -> None:
+        app = spawn_app(self.config_file)
+        serialize_app(app)
+        config_inode, cabinet_inode = self.inodes()
+
+        app.config['DirectoryManager'].rename_game(self.rom, CabinetRegionEnum.REGION_USA, "Renamed")
+        serialize_app(app)
+        new_config_inode, new_cabinet_inode = self.inodes()
+        self.assertNotEqual(config_inode, new_config_inode)
+        self.assertEqual(cabinet_inode, new_cabinet_inode)
+
+        with open(self.config_file, "r") as fp:
+            self.assertIn("Renamed", yaml.safe_load(fp)['filenames'].values())
+
+
+class TestSaveCoordinator(unittest.TestCase):
+    def test_failed_save_is_retried(self) -> None:
+        app = MagicMock()
+        calls: List[Tuple[bool, bool]] = []
+
+        def serialize(app: object, *, config: bool, cabinets: bool) -> None:
+            calls.append((config, cabinets))
+            if len(calls) == 1:
+                raise OSError("No space left on device")
+
+        with patch('netboot.web.app.serialize_app', side_effect=serialize), \
+                patch('netboot.web.app.threading.Thread'):
+            coordinator = _SaveCoordinator(app)
+            coordinator.request_save(cabinets=False)
+            with self.assertRaises(OSError):
+                coordinator.flush()
+
+            # Nothing else changed, but what failed to write should still be pending.
+            coordinator.flush()
+            self.assertEqual([(True, False), (True, False)], calls)
+
+            # And once it has been written, there's nothing left to do.
+            coordinator.flush()
+            self.assertEqual(2, len(calls))
@@ -0,0 +1,41 @@
+from naomi import NaomiRom, NaomiRomRegionEnum
+from netboot.cabinet import CabinetRegionEnum
+from netboot.directory import DirectoryManager
+from tests.helpers import TempDirTestCase
+
+
+class TestDirectoryManager(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        rom = NaomiRom.default()
+        rom.names = {region: f"GAME {region.name}" for region in NaomiRomRegionEnum}
+        self.naomi = self.write("naomi.bin", rom.data + (b"\0" * 0x300))
+        self.other = self.write("some_other_game.bin", b"\x01" * 0x100)
+
+        self.regions = [region for region in CabinetRegionEnum if region != CabinetRegionEnum.REGION_UNKNOWN]
+
+    def test_game_name(self) -> None:
+        manager = DirectoryManager([self.tempdir.name], {})
+        self.assertEqual("GAME REGION_USA", manager.game_name(self.naomi, CabinetRegionEnum.REGION_USA))
+        self.assertEqual("GAME REGION_KOREA", manager.game_name(self.naomi, CabinetRegionEnum.REGION_KOREA))
+        self.assertEqual("some other game", manager.game_name(self.other, CabinetRegionEnum.REGION_USA))
+
+    def test_game_names_matches_game_name(self) -> None:
+        for filename in [self.naomi, self.other]:
+            batch = DirectoryManager([self.tempdir.name], {}).game_names(filename, self.regions)
+
+            single = DirectoryManager([self.tempdir.name], {})
+            self.assertEqual({region: single.game_name(filename, region) for region in self.regions}, batch)
+
+    def test_game_names_shares_renames(self) -> None:
+        manager = DirectoryManager([self.tempdir.name], {})
+        manager.rename_game(self.naomi, CabinetRegionEnum.REGION_USA, "Renamed")
+
+        names = manager.game_names(self.naomi, self.regions)
+        self.assertEqual("Renamed", names[CabinetRegionEnum.REGION_USA])
+        self.assertEqual("GAME REGION_JAPAN", names[CabinetRegionEnum.REGION_JAPAN])
+
+        # Renames are remembered by checksum, so a fresh manager picks them up too.
+        fresh = DirectoryManager([self.tempdir.name], manager.checksums)
+        self.assertEqual(names, fresh.game_names(self.naomi, self.regions))
@@ -0,0 +1,78 @@
+import os
+import stat
+import tempfile
+import unittest
+
+from netboot.fileutils import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempdir.name, "config.yaml")
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def read(self, filename: str) -> str:
+        with open(filename, "r") as fp:
+            return fp.read()
+
+    def test_writes_new_file(self) -> None:
+        umask = os.umask(0o027)
+        try:
+            with atomic_write(self.filename) as fp:
+                fp.write("new")
+        finally:
+            os.umask(umask)
+
+        self.assertEqual("new", self.read(self.filename))
+        self.assertEqual(0o640, stat.S_IMODE(os.stat(self.filename).st_mode))
+        self.assertEqual(["config.yaml"], os.listdir(self.tempdir.name))
+
+    def test_keeps_mode(self) -> None:
+        with open(self.filename, "w") as fp:
+            fp.write("old")
+        os.chmod(self.filename, 0o604)
+
+        with atomic_write(self.filename) as fp:
+            fp.write("new")
+
+        self.assertEqual("new", self.read(self.filename))
+        self.assertEqual(0o604, stat.S_IMODE(os.stat(self.filename).st_mode))
+
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "Need to be root to change file ownership")
+    def test_keeps_owner(self) -> None:
+        with open(self.filename, "w") as fp:
+            fp.write("old")
+        os.chown(self.filename, 1234, 5678)
+
+        with atomic_write(self.filename) as fp:
+            fp.write("new")
+
+        st = os.stat(self.filename)
+        self.assertEqual((1234, 5678), (st.st_uid, st.st_gid))
+
+    def test_replaces_symlink_target(self) -> None:
+        target = os.path.join(self.tempdir.name, "real.yaml")
+        with open(target, "w") as fp:
+            fp.write("old")
+        os.symlink(target, self.filename)
+
+        with atomic_write(self.filename) as fp:
+            fp.write("new")
+
+        self.assertTrue(os.path.islink(self.filename))
+        self.assertEqual("new", self.read(target))
+
+    def test_failure_leaves_original(self) -> None:
+        with open(self.filename, "w") as fp:
+            fp.write("old")
+
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.filename) as fp:
+                fp.write("partial")
+                raise RuntimeError("Failed mid-write")
+
+        self.assertEqual("old", self.read(self.filename))
+        self.assertEqual(["config.yaml"], os.listdir(self.tempdir.name))
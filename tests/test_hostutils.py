@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from typing import Any, Dict, List, Set, Tuple
+from unittest.mock import MagicMock, patch
+
+# We import internal stuff here since we don't want to test the public
+# interfaces.
+from netboot.hostutils import Host, HostException, _PingPoller
+
+
+class TestPingPoller(unittest.TestCase):
+    def test_slow_host_does_not_stall_others(self) -> None:
+        pings: Dict[str, List[float]] = {"1.2.3.4": [], "5.6.7.8": []}
+
+        def ping(ips: Set[str]) -> Set[str]:
+            now = time.time()
+            for ip in ips:
+                pings[ip].append(now)
+            return ips
+
+        poller = _PingPoller()
+        poller.ROUND_SECONDS = 0.05
+        with patch.object(_PingPoller, '_PingPoller__icmp_socket', return_value=None), \
+                patch.object(poller, '_PingPoller__ping_subprocess', side_effect=ping), \
+                patch('netboot.hostutils._poller', poller):
+            slow = Host("1.2.3.4", quiet=True)
+            fast = Host("5.6.7.8", quiet=True)
+
+            deadline = time.time() + 5.0
+            while not pings[fast.ip] and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(pings[fast.ip])
+
+            # Hold the slow host's lock the same way a long net dimm request would. The
+            # other host should keep getting pinged on its normal one second schedule.
+            with slow._Host__lock:  # type: ignore
+                start = time.time()
+                time.sleep(1.5)
+                self.assertTrue([t for t in pings[fast.ip] if t > start])
+
+    def test_hostname_comes_alive(self) -> None:
+        sent: List[str] = []
+        replies: List[Tuple[bytes, Tuple[str, int]]] = []
+
+        class FakeSocket:
+            def sendto(self, packet: bytes, address: Tuple[str, int]) -> None:
+                # Echo back a reply from wherever the request went.
+                sent.append(address[0])
+                replies.append((b"\0" + packet[1:], (address[0], 0)))
+
+            def recvfrom(self, size: int) -> Tuple[bytes, Tuple[str, int]]:
+                return replies.pop(0)
+
+        sock = FakeSocket()
+        poller = _PingPoller()
+        poller.ROUND_SECONDS = 0.05
+        with patch('netboot.hostutils.socket.gethostbyname', side_effect={"cabinet.local": "10.0.0.5", "1.2.3.4": "1.2.3.4"}.get), \
+                patch('netboot.hostutils.select.select', side_effect=lambda r, w, x, t: ([sock] if replies else [], [], [])):
+            responded = poller._PingPoller__ping_icmp(sock, {"cabinet.local", "1.2.3.4"})  # type: ignore
+
+        self.assertEqual({"10.0.0.5", "1.2.3.4"}, set(sent))
+        self.assertEqual({"cabinet.local", "1.2.3.4"}, responded)
+
+
+class TestHostTransfer(unittest.TestCase):
+    def test_send_refuses_while_cancelled_transfer_unwinds(self) -> None:
+        release = threading.Event()
+        events: List[str] = []
+
+        def send_file(host: str, filename: str, *args: Any) -> None:
+            # Pretend to be stuck in socket I/O, where cancellation isn't noticed.
+            progress_queue = args[-3]
+            events.append(f"start {filename}")
+            progress_queue.put(("progress", (0, 100)))
+            release.wait()
+            events.append(f"end {filename}")
+
+        with patch('netboot.hostutils._poller', MagicMock()), \
+                patch('netboot.hostutils._send_file_to_host', side_effect=send_file):
+            host = Host("1.2.3.4", quiet=True)
+            host.send("first.bin", [], {})
+
+            # Cancel it the way a power off does. Sending again shouldn't block, but it
+            # shouldn't start a second transfer either.
+            host.alive = False
+            self.assertTrue(host.cancelling)
+            with self.assertRaises(HostException):
+                host.send("second.bin", [], {})
+            self.assertEqual(["start first.bin"], events)
+
+            release.set()
+            deadline = time.time() + 5.0
+            while host.cancelling and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertFalse(host.cancelling)
+
+            host.send("second.bin", [], {})
+            self.assertEqual(["start first.bin", "end first.bin", "start second.bin"], events[:3])
@@ -0,0 +1,61 @@
+import os
+
+from naomi import NaomiRom
+from netboot.patch import PatchManager
+from tests.helpers import TempDirTestCase
+
+
+class TestPatchManager(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.romdir = self.mkdir("roms")
+        self.patchdir = self.mkdir("patches")
+
+        # One Naomi ROM and one random file of a different size.
+        self.naomi = self.write("roms/naomi.bin", NaomiRom.default().data + (b"\0" * 0x300))
+        self.other = self.write("roms/other.bin", b"\x01" * 0x100)
+
+        self.write("patches/naomi_fix.bindiff", "# Description: naomi fix\n# File size: 2048\n600: 00 -> 01\n")
+        self.write("patches/naomi_bad.bindiff", "# File size: 2048\n600: 55 -> 01\n")
+        self.write("patches/other_fix.bindiff", "# File size: 256\n10: 01 -> 02\n")
+        self.write("patches/any_size.bindiff", "20: 01 -> 03\n")
+
+    def test_patches_for_game(self) -> None:
+        manager = PatchManager([self.patchdir])
+        self.assertEqual(
+            [os.path.join(self.patchdir, "naomi_fix.bindiff")],
+            manager.patches_for_game(self.naomi),
+        )
+        self.assertEqual(
+            sorted([os.path.join(self.patchdir, "other_fix.bindiff"), os.path.join(self.patchdir, "any_size.bindiff")]),
+            sorted(manager.patches_for_game(self.other)),
+        )
+
+    def test_patches_for_games_matches_patches_for_game(self) -> None:
+        batch = PatchManager([self.patchdir]).patches_for_games([self.naomi, self.other])
+
+        single = PatchManager([self.patchdir])
+        self.assertEqual(
+            {
+                self.naomi: single.patches_for_game(self.naomi),
+                self.other: single.patches_for_game(self.other),
+            },
+            batch,
+        )
+
+    def test_patches_for_games_shares_cache(self) -> None:
+        manager = PatchManager([self.patchdir])
+        before = manager.patches_for_game(self.naomi)
+
+        # A cached game shouldn't be looked at again until we recalculate.
+        os.remove(os.path.join(self.patchdir, "naomi_fix.bindiff"))
+        self.assertEqual({self.naomi: before}, manager.patches_for_games([self.naomi]))
+
+        manager.recalculate(self.naomi)
+        self.assertEqual({self.naomi: []}, manager.patches_for_games([self.naomi]))
+        self.assertEqual([], manager.patches_for_game(self.naomi))
+
+    def test_patch_name(self) -> None:
+        manager = PatchManager([self.patchdir])
+        self.assertEqual("naomi fix", manager.patch_name(os.path.join(self.patchdir, "naomi_fix.bindiff")))
+        self.assertEqual("naomi bad", manager.patch_name(os.path.join(self.patchdir, "naomi_bad.bindiff")))
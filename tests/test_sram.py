@@ -0,0 +1,56 @@
+import os
+from unittest.mock import patch
+
+from naomi import NaomiRom, NaomiSettingsPatcher
+from netboot.sram import SRAMManager
+from tests.helpers import TempDirTestCase
+
+
+class TestSRAMManager(TempDirTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.romdir = self.mkdir("roms")
+        self.sramdir = self.mkdir("srams")
+
+        self.naomi = self.write("roms/naomi.bin", NaomiRom.default().data + (b"\0" * 0x300))
+        self.other = self.write("roms/other.bin", b"\x01" * 0x100)
+
+        # Only SRAM files of exactly the right size should ever be offered.
+        self.sram = self.write("srams/save.sram", b"\0" * NaomiSettingsPatcher.SRAM_SIZE)
+        self.write("srams/short.sram", b"\0" * 10)
+
+    def test_srams_for_game(self) -> None:
+        manager = SRAMManager([self.sramdir])
+        self.assertEqual([self.sram], manager.srams_for_game(self.naomi))
+        self.assertEqual([], manager.srams_for_game(self.other))
+
+    def test_srams_for_games_matches_srams_for_game(self) -> None:
+        batch = SRAMManager([self.sramdir]).srams_for_games([self.naomi, self.other])
+
+        single = SRAMManager([self.sramdir])
+        self.assertEqual(
+            {
+                self.naomi: single.srams_for_game(self.naomi),
+                self.other: single.srams_for_game(self.other),
+            },
+            batch,
+        )
+
+    def test_srams_for_games_shares_cache(self) -> None:
+        manager = SRAMManager([self.sramdir])
+        manager.srams_for_games([self.naomi])
+
+        # A cached game shouldn't be looked at again until we recalculate.
+        os.remove(self.sram)
+        self.assertEqual([self.sram], manager.srams_for_game(self.naomi))
+
+        manager.recalculate()
+        self.assertEqual({self.naomi: []}, manager.srams_for_games([self.naomi]))
+
+    def test_invalid_rom_does_not_scan(self) -> None:
+        manager = SRAMManager([self.sramdir])
+        with patch('netboot.sram.os.listdir') as listdir:
+            self.assertEqual([], manager.srams_for_game(self.other))
+            manager.recalculate()
+            self.assertEqual({self.other: []}, manager.srams_for_games([self.other]))
+        listdir.assert_not_called()